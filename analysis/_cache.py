@@ -0,0 +1,30 @@
+"""
+Pickle memoization of parsed/aggregated frames for the analysis scripts.
+
+Used by analyze_amx.py, analyze_parallel.py, compare_mac_graviton.py,
+generate_publication_plots.py and _findings_common.py, and (via sys.path)
+by analyze_composition.py, results/dag_statistical/statistical_analysis.py
+and results/io_overhead/analyze_io_overhead.py.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+
+def cached_frame(csv_path, name, build, script):
+    """Return build(), memoized as <csv dir>/.cache/<csv stem>.<name>.pkl.
+
+    script is the caller's __file__. The pickle is rebuilt whenever the CSV,
+    the calling script or this module is newer than it. Pickling (rather than
+    re-parsing the CSV) keeps categorical dtypes and MultiIndexes intact.
+    """
+    csv_path = Path(csv_path)
+    cache = csv_path.parent / '.cache' / f'{csv_path.stem}.{name}.pkl'
+    source_mtime = max(Path(p).stat().st_mtime for p in (csv_path, script, __file__))
+    if cache.exists() and cache.stat().st_mtime >= source_mtime:
+        return pd.read_pickle(cache)
+    frame = build()
+    cache.parent.mkdir(exist_ok=True)
+    frame.to_pickle(cache)
+    return frame
@@ -0,0 +1,96 @@
+"""
+Shared helpers for the FINDINGS.md generators.
+
+Used by generate_graviton_findings.py and generate_power_findings.py:
+CSV loading, report-order sorting, and a buffered Markdown writer.
+"""
+
+import hashlib
+import io
+from pathlib import Path
+
+import pandas as pd
+
+import _cache
+from _cache import cached_frame
+
+# Report order of benchmark configurations
+CONFIG_RANK = {'naive': 0, 'neon': 1, 'neon_4t': 2, 'neon_8t': 3}
+
+# Columns every findings report groups and labels by
+KEY_COLUMNS = ['operation', 'config', 'scale', 'num_sequences']
+
+
+def _source_mtime(*paths):
+    """Latest modification time of paths, this module and the cache helper."""
+    return max(Path(p).stat().st_mtime for p in (*paths, __file__, _cache.__file__))
+
+
+def _source_stamp_path(output_path):
+    """Where the input a report was generated from is recorded (gitignored)."""
+    return output_path.parent / '.cache' / f'{output_path.name}.source'
+
+
+def _source_stamp(csv_path):
+    """Identify csv_path by resolved path, mtime and size."""
+    st = Path(csv_path).stat()
+    return f"{Path(csv_path).resolve()}\n{st.st_mtime_ns}\n{st.st_size}\n"
+
+
+def load_csv(csv_path, numeric_cols):
+    """Load the key columns plus numeric_cols (as float64) from csv_path.
+
+    Columns the report doesn't read are skipped at parse time. The parsed
+    frame is memoized per column set, so the two reports never read each
+    other's cache.
+    """
+    columns = [*KEY_COLUMNS, *numeric_cols]
+    name = 'findings-' + hashlib.md5(','.join(columns).encode()).hexdigest()[:8]
+    return cached_frame(csv_path, name, lambda: pd.read_csv(
+        csv_path, usecols=columns, dtype=dict.fromkeys(numeric_cols, 'float64')), __file__)
+
+
+def is_up_to_date(output_path, csv_path, *sources):
+    """True if output_path was generated from this exact csv_path and is newer
+    than it, every other source and the shared modules.
+
+    Reports without a recorded input (e.g. fresh from a checkout) or built
+    from a different CSV in the same directory are never up to date.
+    """
+    stamp = _source_stamp_path(output_path)
+    return (output_path.exists() and stamp.exists()
+            and stamp.read_text() == _source_stamp(csv_path)
+            and output_path.stat().st_mtime >= _source_mtime(csv_path, *sources))
+
+
+def record_source(output_path, csv_path):
+    """Record that output_path was just generated from csv_path."""
+    stamp = _source_stamp_path(output_path)
+    stamp.parent.mkdir(exist_ok=True)
+    stamp.write_text(_source_stamp(csv_path))
+
+
+def ordered_rows(df):
+    """Rows as namedtuples sorted by operation, scale and config rank.
+
+    The order lets callers walk operations and scales in a single pass with
+    itertools.groupby.
+    """
+    ranked = df.assign(_cfg_rank=df['config'].map(CONFIG_RANK).fillna(99))
+    return ranked.sort_values(['operation', 'scale', '_cfg_rank'], kind='stable').itertuples(index=False)
+
+
+class MarkdownBuffer(io.StringIO):
+    """In-memory Markdown document written to disk with a single write."""
+
+    def table(self, header, separator, rows):
+        """Write a Markdown table (and trailing blank line) in one call.
+
+        header and separator are the literal first two lines; each row is a
+        sequence of pre-formatted cell strings.
+        """
+        lines = [header, separator, *("| " + " | ".join(cells) + " |" for cells in rows)]
+        self.write("\n".join(lines) + "\n\n")
+
+    def save(self, path):
+        path.write_text(self.getvalue())
@@ -9,114 +9,32 @@ Generates:
 - Decision rules
 """
 
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use('Agg')  # headless: figures are only ever saved, never shown
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import seaborn as sns
 import numpy as np
 from pathlib import Path
 
+from _cache import cached_frame
+
 # Set style
 sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (14, 8)
-plt.rcParams['font.size'] = 10
-
-# Load data
-csv_path = Path("results/parallel_dimension_raw_20251031_152922.csv")
-df = pd.read_csv(csv_path)
-
-print(f"Loaded {len(df)} experiments")
-print(f"Operations: {df['operation'].unique()}")
-print(f"Scales: {df['scale'].unique()}")
-print(f"Thread counts: {sorted(df['threads'].unique())}")
-print(f"Assignments: {df['assignment'].unique()}")
-print()
+matplotlib.rcParams['figure.figsize'] = (14, 8)
+matplotlib.rcParams['font.size'] = 10
 
-# Create output directory
-output_dir = Path("results/parallel_analysis")
-output_dir.mkdir(exist_ok=True)
-
-# ============================================================================
-# 1. SPEEDUP MATRICES PER OPERATION
-# ============================================================================
-
-print("=" * 70)
-print("SPEEDUP MATRICES BY OPERATION")
-print("=" * 70)
-print()
-
-with open(output_dir / "speedup_matrices.txt", "w") as f:
-    for operation in sorted(df['operation'].unique()):
-        op_data = df[df['operation'] == operation]
-        complexity = op_data['complexity'].iloc[0]
-
-        print(f"\n{'='*70}")
-        print(f"Operation: {operation} (complexity {complexity:.2f})")
-        print(f"{'='*70}\n")
-
-        f.write(f"\n{'='*70}\n")
-        f.write(f"Operation: {operation} (complexity {complexity:.2f})\n")
-        f.write(f"{'='*70}\n\n")
-
-        # Create pivot table: rows=config, cols=scale
-        for assignment in ['default', 'p_cores', 'e_cores']:
-            config_data = op_data[op_data['assignment'] == assignment]
-
-            if len(config_data) == 0:
-                continue
-
-            pivot = config_data.pivot_table(
-                values='speedup_vs_1t',
-                index='threads',
-                columns='scale',
-                aggfunc='mean'
-            )
-
-            # Reorder columns by num_sequences
-            scale_order = ['Tiny', 'Small', 'Medium', 'Large', 'VeryLarge', 'Huge']
-            pivot = pivot[[col for col in scale_order if col in pivot.columns]]
-
-            print(f"{assignment.upper():15s}  ", end="")
-            f.write(f"{assignment.upper():15s}  ")
-            for col in pivot.columns:
-                print(f"{col:>12s}", end="")
-                f.write(f"{col:>12s}")
-            print()
-            f.write("\n")
-            print("-" * (15 + 12 * len(pivot.columns)))
-            f.write("-" * (15 + 12 * len(pivot.columns)) + "\n")
-
-            for threads in sorted(pivot.index):
-                print(f"{threads}t {assignment:13s}  ", end="")
-                f.write(f"{threads}t {assignment:13s}  ")
-                for col in pivot.columns:
-                    speedup = pivot.loc[threads, col]
-                    if pd.notna(speedup):
-                        print(f"{speedup:11.2f}×", end="")
-                        f.write(f"{speedup:11.2f}×")
-                    else:
-                        print(f"{'N/A':>12s}", end="")
-                        f.write(f"{'N/A':>12s}")
-                print()
-                f.write("\n")
-            print()
-            f.write("\n")
-
-print(f"\nSpeedup matrices saved to: {output_dir / 'speedup_matrices.txt'}")
-
-# ============================================================================
-# 2. VISUALIZATIONS
-# ============================================================================
-
-print("\n" + "=" * 70)
-print("GENERATING VISUALIZATIONS")
-print("=" * 70)
-print()
-
-# Figure 1: Speedup curves for all operations (8 threads, default)
-fig, axes = plt.subplots(2, 5, figsize=(20, 8))
-axes = axes.flatten()
+# Raster resolution for saved PNGs. 150 dpi keeps the figures legible on
+# screen and in slides at a quarter of the pixels (and deflate time) of 300.
+FIGURE_DPI = 150
 
 scale_order = ['Tiny', 'Small', 'Medium', 'Large', 'VeryLarge', 'Huge']
+assignment_order = ['default', 'p_cores', 'e_cores']
 num_seqs_map = {
     'Tiny': 100,
     'Small': 1000,
@@ -125,354 +43,481 @@ num_seqs_map = {
     'VeryLarge': 1000000,
     'Huge': 10000000
 }
+selected_ops = ['base_counting', 'complexity_score', 'reverse_complement',
+                'sequence_length', 'quality_aggregation', 'n_content']
+
+# Explicit dtypes skip inference and parse the keys straight into
+# fixed-order categoricals, so groupby/pivot/sort run on integer codes
+CSV_DTYPES = {
+    'operation': 'category',
+    'complexity': 'float64',
+    'scale': pd.CategoricalDtype(scale_order, ordered=True),
+    'num_sequences': 'int64',
+    'threads': 'int16',
+    'assignment': pd.CategoricalDtype(assignment_order),
+    'speedup_vs_1t': 'float64',
+    'efficiency': 'float64',
+}
+
+
+def new_figure(figsize, nrows=1, ncols=1):
+    """Create an Agg-backed figure outside pyplot's global figure manager."""
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots(nrows, ncols)
+
+
+# ============================================================================
+# FIGURE RENDERERS
+# ============================================================================
+# Each renderer receives a small precomputed payload (not the DataFrame) so it
+# can run in a worker process.
+
+def render_speedup_curves(curves, path):
+    """Figure 1: Speedup curves for all operations (default assignment).
+
+    curves: list of (operation, complexity, {threads: speedups in scale_order})
+    """
+    fig, axes = new_figure((20, 8), 2, 5)
+    axes = axes.flatten()
+
+    x = [num_seqs_map[s] for s in scale_order]
+    for ax, (operation, complexity, by_threads) in zip(axes, curves):
+        # Plot speedup vs scale for each thread count
+        for threads, y in by_threads.items():
+            if threads == 1:
+                ax.plot(x, y, 'o-', linewidth=2, markersize=6, label=f'{threads}t', alpha=0.3)
+            else:
+                ax.plot(x, y, 'o-', linewidth=2, markersize=6, label=f'{threads}t')
+
+        ax.set_xscale('log')
+        ax.set_xlabel('Sequences (log scale)')
+        ax.set_ylabel('Speedup vs 1t')
+        ax.set_title(f'{operation}\n(complexity {complexity:.2f})', fontsize=10)
+        ax.legend(fontsize=8)
+        ax.grid(True, alpha=0.3)
+        ax.axhline(y=1, color='gray', linestyle='--', linewidth=1, alpha=0.5)
 
-for idx, operation in enumerate(sorted(df['operation'].unique())):
-    ax = axes[idx]
-    op_data = df[(df['operation'] == operation) & (df['assignment'] == 'default')]
-    complexity = op_data['complexity'].iloc[0]
+    fig.tight_layout()
+    fig.savefig(path, dpi=FIGURE_DPI, bbox_inches='tight')
 
-    # Plot speedup vs scale for each thread count
-    for threads in [1, 2, 4, 8]:
-        thread_data = op_data[op_data['threads'] == threads]
 
-        # Order by scale
-        thread_data = thread_data.set_index('scale')
-        thread_data = thread_data.reindex(scale_order)
+def render_core_assignment(operations, speedups_default, speedups_p, speedups_e, path):
+    """Figure 2: P-core vs E-core comparison (8 threads, Huge scale)."""
+    fig, ax = new_figure((14, 8))
 
-        x = [num_seqs_map[s] for s in thread_data.index if s in num_seqs_map]
-        y = thread_data['speedup_vs_1t'].values
+    x_pos = np.arange(len(operations))
+    width = 0.25
 
-        if threads == 1:
-            ax.plot(x, y, 'o-', linewidth=2, markersize=6, label=f'{threads}t', alpha=0.3)
-        else:
-            ax.plot(x, y, 'o-', linewidth=2, markersize=6, label=f'{threads}t')
+    ax.bar(x_pos - width, speedups_default, width, label='Default', alpha=0.8)
+    ax.bar(x_pos, speedups_p, width, label='P-cores', alpha=0.8)
+    ax.bar(x_pos + width, speedups_e, width, label='E-cores', alpha=0.8)
 
-    ax.set_xscale('log')
-    ax.set_xlabel('Sequences (log scale)')
     ax.set_ylabel('Speedup vs 1t')
-    ax.set_title(f'{operation}\n(complexity {complexity:.2f})', fontsize=10)
-    ax.legend(fontsize=8)
-    ax.grid(True, alpha=0.3)
+    ax.set_title('Core Assignment Comparison (8 threads, Huge scale - 10M sequences)', fontsize=14, fontweight='bold')
+    ax.set_xticks(x_pos)
+    ax.set_xticklabels(operations, rotation=45, ha='right')
+    ax.legend()
+    ax.grid(True, alpha=0.3, axis='y')
     ax.axhline(y=1, color='gray', linestyle='--', linewidth=1, alpha=0.5)
 
-plt.tight_layout()
-plt.savefig(output_dir / 'speedup_curves_all_ops.png', dpi=300, bbox_inches='tight')
-print(f"Saved: {output_dir / 'speedup_curves_all_ops.png'}")
-plt.close()
-
-# Figure 2: P-core vs E-core comparison (8 threads, large scale)
-fig, ax = plt.subplots(figsize=(14, 8))
-
-operations = sorted(df['operation'].unique())
-x_pos = np.arange(len(operations))
-width = 0.25
-
-large_scale = 'Huge'
-data_8t = df[(df['threads'] == 8) & (df['scale'] == large_scale)]
-
-speedups_default = []
-speedups_p = []
-speedups_e = []
-
-for op in operations:
-    op_data = data_8t[data_8t['operation'] == op]
-    speedups_default.append(op_data[op_data['assignment'] == 'default']['speedup_vs_1t'].mean())
-    speedups_p.append(op_data[op_data['assignment'] == 'p_cores']['speedup_vs_1t'].mean())
-    speedups_e.append(op_data[op_data['assignment'] == 'e_cores']['speedup_vs_1t'].mean())
-
-ax.bar(x_pos - width, speedups_default, width, label='Default', alpha=0.8)
-ax.bar(x_pos, speedups_p, width, label='P-cores', alpha=0.8)
-ax.bar(x_pos + width, speedups_e, width, label='E-cores', alpha=0.8)
-
-ax.set_ylabel('Speedup vs 1t')
-ax.set_title(f'Core Assignment Comparison (8 threads, {large_scale} scale - 10M sequences)', fontsize=14, fontweight='bold')
-ax.set_xticks(x_pos)
-ax.set_xticklabels(operations, rotation=45, ha='right')
-ax.legend()
-ax.grid(True, alpha=0.3, axis='y')
-ax.axhline(y=1, color='gray', linestyle='--', linewidth=1, alpha=0.5)
-
-plt.tight_layout()
-plt.savefig(output_dir / 'core_assignment_comparison.png', dpi=300, bbox_inches='tight')
-print(f"Saved: {output_dir / 'core_assignment_comparison.png'}")
-plt.close()
-
-# Figure 3: Efficiency (speedup/threads) heatmap
-fig, ax = plt.subplots(figsize=(14, 10))
-
-# Calculate average efficiency across all scales for 8 threads, default
-efficiency_data = []
-for op in sorted(df['operation'].unique()):
-    op_data = df[(df['operation'] == op) & (df['threads'] == 8) & (df['assignment'] == 'default')]
-    for scale in scale_order:
-        scale_data = op_data[op_data['scale'] == scale]
-        if len(scale_data) > 0:
-            efficiency = scale_data['efficiency'].mean()
-            efficiency_data.append({
-                'operation': op,
-                'scale': scale,
-                'efficiency': efficiency
-            })
-
-eff_df = pd.DataFrame(efficiency_data)
-pivot_eff = eff_df.pivot(index='operation', columns='scale', values='efficiency')
-pivot_eff = pivot_eff[scale_order]
-
-sns.heatmap(pivot_eff, annot=True, fmt='.2f', cmap='RdYlGn', center=0.5,
-            vmin=0, vmax=1.0, ax=ax, cbar_kws={'label': 'Efficiency (speedup/threads)'})
-ax.set_title('Parallel Efficiency (8 threads, default) - Higher is Better', fontsize=14, fontweight='bold')
-ax.set_xlabel('Scale')
-ax.set_ylabel('Operation')
-
-plt.tight_layout()
-plt.savefig(output_dir / 'efficiency_heatmap.png', dpi=300, bbox_inches='tight')
-print(f"Saved: {output_dir / 'efficiency_heatmap.png'}")
-plt.close()
-
-# Figure 4: Complexity vs Max Speedup scatter
-fig, ax = plt.subplots(figsize=(12, 8))
-
-max_speedups = []
-for op in sorted(df['operation'].unique()):
-    op_data = df[df['operation'] == op]
-    complexity = op_data['complexity'].iloc[0]
-    max_speedup = op_data['speedup_vs_1t'].max()
-    max_speedups.append({
-        'operation': op,
-        'complexity': complexity,
-        'max_speedup': max_speedup
-    })
+    fig.tight_layout()
+    fig.savefig(path, dpi=FIGURE_DPI, bbox_inches='tight')
 
-max_df = pd.DataFrame(max_speedups)
 
-ax.scatter(max_df['complexity'], max_df['max_speedup'], s=200, alpha=0.6, edgecolors='black', linewidth=2)
+def render_efficiency_heatmap(pivot_eff, path):
+    """Figure 3: Efficiency (speedup/threads) heatmap."""
+    fig, ax = new_figure((14, 10))
 
-for _, row in max_df.iterrows():
-    ax.annotate(row['operation'],
-                (row['complexity'], row['max_speedup']),
-                xytext=(5, 5), textcoords='offset points', fontsize=9)
+    values = pivot_eff.to_numpy()
+    im = ax.imshow(values, cmap='RdYlGn', vmin=0, vmax=1.0, aspect='auto')
+    fig.colorbar(im, ax=ax, label='Efficiency (speedup/threads)')
+    ax.set_xticks(range(len(pivot_eff.columns)))
+    ax.set_xticklabels(pivot_eff.columns)
+    ax.set_yticks(range(len(pivot_eff.index)))
+    ax.set_yticklabels(pivot_eff.index)
+    ax.grid(False)
 
-ax.set_xlabel('Operation Complexity', fontsize=12)
-ax.set_ylabel('Maximum Speedup Achieved', fontsize=12)
-ax.set_title('Complexity vs Maximum Parallel Speedup', fontsize=14, fontweight='bold')
-ax.grid(True, alpha=0.3)
+    # Annotate cells; light text on the dark ends of the colormap
+    for (i, j), v in np.ndenumerate(values):
+        if np.isnan(v):
+            continue
+        ax.text(j, i, f'{v:.2f}', ha='center', va='center',
+                color='white' if v < 0.15 or v > 0.85 else 'black')
+    ax.set_title('Parallel Efficiency (8 threads, default) - Higher is Better', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Scale')
+    ax.set_ylabel('Operation')
 
-# Add trend line
-z = np.polyfit(max_df['complexity'], max_df['max_speedup'], 1)
-p = np.poly1d(z)
-x_line = np.linspace(max_df['complexity'].min(), max_df['complexity'].max(), 100)
-ax.plot(x_line, p(x_line), "r--", alpha=0.5, linewidth=2, label=f'Trend: y={z[0]:.2f}x+{z[1]:.2f}')
-ax.legend()
+    fig.tight_layout()
+    fig.savefig(path, dpi=FIGURE_DPI, bbox_inches='tight')
 
-plt.tight_layout()
-plt.savefig(output_dir / 'complexity_vs_speedup.png', dpi=300, bbox_inches='tight')
-print(f"Saved: {output_dir / 'complexity_vs_speedup.png'}")
-plt.close()
 
-# Figure 5: Thread scaling comparison (selected operations)
-fig, axes = plt.subplots(2, 3, figsize=(18, 10))
-axes = axes.flatten()
+def render_complexity_vs_speedup(max_df, path):
+    """Figure 4: Complexity vs Max Speedup scatter."""
+    fig, ax = new_figure((12, 8))
 
-selected_ops = ['base_counting', 'complexity_score', 'reverse_complement',
-                'sequence_length', 'quality_aggregation', 'n_content']
+    ax.scatter(max_df['complexity'], max_df['max_speedup'], s=200, alpha=0.6, edgecolors='black', linewidth=2)
 
-for idx, op in enumerate(selected_ops):
-    ax = axes[idx]
-    op_data = df[(df['operation'] == op) & (df['assignment'] == 'default')]
-    complexity = op_data['complexity'].iloc[0]
+    for _, row in max_df.iterrows():
+        ax.annotate(row['operation'],
+                    (row['complexity'], row['max_speedup']),
+                    xytext=(5, 5), textcoords='offset points', fontsize=9)
 
-    # Plot by scale
-    for scale in ['Small', 'Medium', 'Large', 'VeryLarge', 'Huge']:
-        scale_data = op_data[op_data['scale'] == scale]
-        if len(scale_data) > 0:
-            threads = scale_data['threads'].values
-            speedups = scale_data['speedup_vs_1t'].values
+    ax.set_xlabel('Operation Complexity', fontsize=12)
+    ax.set_ylabel('Maximum Speedup Achieved', fontsize=12)
+    ax.set_title('Complexity vs Maximum Parallel Speedup', fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3)
 
+    # Add trend line (closed-form least squares; a straight line only needs its endpoints)
+    x = max_df['complexity'].to_numpy()
+    y = max_df['max_speedup'].to_numpy()
+    x_mean, y_mean = x.mean(), y.mean()
+    slope = ((x - x_mean) * (y - y_mean)).sum() / ((x - x_mean) ** 2).sum()
+    intercept = y_mean - slope * x_mean
+    x_line = np.array([x.min(), x.max()])
+    ax.plot(x_line, slope * x_line + intercept, "r--", alpha=0.5, linewidth=2,
+            label=f'Trend: y={slope:.2f}x+{intercept:.2f}')
+    ax.legend()
+
+    fig.tight_layout()
+    fig.savefig(path, dpi=FIGURE_DPI, bbox_inches='tight')
+
+
+def render_thread_scaling(scaling, path):
+    """Figure 5: Thread scaling comparison (selected operations).
+
+    scaling: list of (operation, complexity, [(scale, threads, speedups), ...])
+    """
+    fig, axes = new_figure((18, 10), 2, 3)
+    axes = axes.flatten()
+
+    for ax, (op, complexity, by_scale) in zip(axes, scaling):
+        # Plot by scale
+        for scale, threads, speedups in by_scale:
             if scale in ['Large', 'VeryLarge', 'Huge']:
                 ax.plot(threads, speedups, 'o-', linewidth=2, markersize=8, label=scale)
             else:
                 ax.plot(threads, speedups, 'o-', linewidth=1, markersize=4, label=scale, alpha=0.4)
 
-    # Add ideal scaling line
-    ax.plot([1, 2, 4, 8], [1, 2, 4, 8], 'k--', alpha=0.3, linewidth=2, label='Ideal')
-
-    ax.set_xlabel('Threads')
-    ax.set_ylabel('Speedup vs 1t')
-    ax.set_title(f'{op} (complexity {complexity:.2f})', fontsize=11, fontweight='bold')
-    ax.legend(fontsize=8, loc='upper left')
-    ax.grid(True, alpha=0.3)
-    ax.set_xticks([1, 2, 4, 8])
-
-plt.tight_layout()
-plt.savefig(output_dir / 'thread_scaling_comparison.png', dpi=300, bbox_inches='tight')
-print(f"Saved: {output_dir / 'thread_scaling_comparison.png'}")
-plt.close()
-
-print("\nAll visualizations generated successfully!")
+        # Add ideal scaling line
+        ax.plot([1, 2, 4, 8], [1, 2, 4, 8], 'k--', alpha=0.3, linewidth=2, label='Ideal')
+
+        ax.set_xlabel('Threads')
+        ax.set_ylabel('Speedup vs 1t')
+        ax.set_title(f'{op} (complexity {complexity:.2f})', fontsize=11, fontweight='bold')
+        ax.legend(fontsize=8, loc='upper left')
+        ax.grid(True, alpha=0.3)
+        ax.set_xticks([1, 2, 4, 8])
+
+    fig.tight_layout()
+    fig.savefig(path, dpi=FIGURE_DPI, bbox_inches='tight')
+
+
+def main():
+    # Load data
+    csv_path = Path("results/parallel_dimension_raw_20251031_152922.csv")
+    # Sorted once by the grouping keys, so groupbys can skip their own sort
+    df = cached_frame(csv_path, 'raw', lambda: pd.read_csv(
+        csv_path, dtype=CSV_DTYPES, usecols=list(CSV_DTYPES)
+    ).sort_values(['operation', 'scale', 'threads', 'assignment', 'num_sequences'],
+                  kind='stable', ignore_index=True), __file__)
+
+    print(f"Loaded {len(df)} experiments")
+    print(f"Operations: {df['operation'].unique()}")
+    print(f"Scales: {df['scale'].unique()}")
+    print(f"Thread counts: {sorted(df['threads'].unique().tolist())}")
+    print(f"Assignments: {df['assignment'].unique()}")
+    print()
+
+    # Aggregate once; figures, summaries and decision rules all read from these
+    # small per-cell frames via MultiIndex probes instead of re-scanning df
+    gb_mean = cached_frame(csv_path, 'gb_mean', lambda: df.groupby(
+        ['operation', 'scale', 'threads', 'assignment'], observed=True, sort=False
+    )[['speedup_vs_1t', 'efficiency']].mean(), __file__)
+    speedup_by_cell = gb_mean['speedup_vs_1t'].unstack('scale')
+    complexity_by_op = df.groupby('operation', observed=True, sort=False)['complexity'].first()
+    huge_8t_means = gb_mean.xs(('Huge', 8), level=('scale', 'threads'))['speedup_vs_1t']
+    operations = df['operation'].cat.categories.tolist()
+    # operations x assignment at 8 threads / Huge scale, for column-wise comparisons
+    huge_8t_wide = huge_8t_means.unstack('assignment').reindex(index=operations, columns=assignment_order)
+
+    # Create output directory
+    output_dir = Path("results/parallel_analysis")
+    output_dir.mkdir(exist_ok=True)
+
+    # ============================================================================
+    # 1. SPEEDUP MATRICES PER OPERATION
+    # ============================================================================
+
+    print("=" * 70)
+    print("SPEEDUP MATRICES BY OPERATION")
+    print("=" * 70)
+    print()
+
+    # Assemble the report in memory and write it in one call. Every line is
+    # formatted once and the finished text is teed to stdout and the file.
+    with io.StringIO() as f:
+        for operation in operations:
+            complexity = complexity_by_op[operation]
+            op_matrices = speedup_by_cell.xs(operation, level='operation')
+            op_assignments = op_matrices.index.unique(level='assignment')
+
+            f.write(f"\n{'='*70}\n")
+            f.write(f"Operation: {operation} (complexity {complexity:.2f})\n")
+            f.write(f"{'='*70}\n\n")
+
+            # Create pivot table: rows=config, cols=scale
+            for assignment in assignment_order:
+                if assignment not in op_assignments:
+                    continue
+
+                pivot = op_matrices.xs(assignment, level='assignment').dropna(axis=1, how='all')
+
+                header = ''.join(f"{col:>12s}" for col in pivot.columns)
+                f.write(f"{assignment.upper():15s}  {header}\n")
+                f.write("-" * (15 + 12 * len(pivot.columns)) + "\n")
+
+                for threads, row in pivot.sort_index().iterrows():
+                    cells = ''.join(f"{speedup:11.2f}×" if pd.notna(speedup) else f"{'N/A':>12s}"
+                                    for speedup in row)
+                    f.write(f"{threads}t {assignment:13s}  {cells}\n")
+                f.write("\n")
 
-# ============================================================================
-# 3. SUMMARY STATISTICS
-# ============================================================================
+        report = f.getvalue()
+
+    print(report, end="")
+    (output_dir / "speedup_matrices.txt").write_text(report)
+
+    print(f"\nSpeedup matrices saved to: {output_dir / 'speedup_matrices.txt'}")
+
+    # ============================================================================
+    # 2. VISUALIZATIONS
+    # ============================================================================
+
+    print("\n" + "=" * 70)
+    print("GENERATING VISUALIZATIONS")
+    print("=" * 70)
+    print()
+
+    # Figure 1 payload: default-assignment speedup per thread count, in scale order
+    curves = []
+    for operation in operations:
+        by_threads = {
+            threads: speedup_by_cell.loc[(operation, threads, 'default')].reindex(scale_order).to_numpy()
+            for threads in [1, 2, 4, 8]
+        }
+        curves.append((operation, complexity_by_op[operation], by_threads))
+
+    # Figure 2 payload: 8 threads, Huge scale, per assignment
+    speedups_default = huge_8t_wide['default'].to_numpy()
+    speedups_p = huge_8t_wide['p_cores'].to_numpy()
+    speedups_e = huge_8t_wide['e_cores'].to_numpy()
+
+    # Figure 3 payload: average efficiency across all scales for 8 threads, default
+    pivot_eff = (gb_mean['efficiency']
+                 .xs((8, 'default'), level=('threads', 'assignment'))
+                 .unstack('scale')
+                 .reindex(columns=scale_order))
+
+    # Figure 4 payload: best speedup per operation; the best rows (first
+    # maximum of each operation) also feed the summary statistics below
+    best_idx = df.groupby('operation', observed=True, sort=False)['speedup_vs_1t'].idxmax()
+    best_rows = df.loc[best_idx.reindex(operations)].set_index('operation')
+    max_df = pd.DataFrame({
+        'operation': operations,
+        'complexity': complexity_by_op.reindex(operations).to_numpy(),
+        'max_speedup': best_rows['speedup_vs_1t'].to_numpy(),
+    })
 
-print("\n" + "=" * 70)
-print("SUMMARY STATISTICS")
-print("=" * 70)
-print()
-
-with open(output_dir / "summary_statistics.txt", "w") as f:
-    # Overall statistics
-    f.write("OVERALL PARALLEL PERFORMANCE SUMMARY\n")
-    f.write("=" * 70 + "\n\n")
-
-    # Best speedup per operation
-    f.write("Best Speedup Achieved (any configuration):\n")
-    f.write("-" * 70 + "\n")
-    for op in sorted(df['operation'].unique()):
-        op_data = df[df['operation'] == op]
-        complexity = op_data['complexity'].iloc[0]
-        best_row = op_data.loc[op_data['speedup_vs_1t'].idxmax()]
-
-        f.write(f"{op:20s} (complexity {complexity:.2f}): "
-                f"{best_row['speedup_vs_1t']:.2f}× "
-                f"({best_row['threads']}t/{best_row['assignment']}, "
-                f"{best_row['scale']} scale)\n")
-
-    f.write("\n")
-
-    # Average speedup at 8 threads, Huge scale
-    f.write("Speedup at 8 threads, Huge scale (10M sequences):\n")
-    f.write("-" * 70 + "\n")
-    huge_8t = df[(df['scale'] == 'Huge') & (df['threads'] == 8)]
-    for op in sorted(df['operation'].unique()):
-        op_data = huge_8t[huge_8t['operation'] == op]
-        if len(op_data) > 0:
-            avg_speedup = op_data['speedup_vs_1t'].mean()
-            best_assignment = op_data.loc[op_data['speedup_vs_1t'].idxmax(), 'assignment']
-            best_speedup = op_data['speedup_vs_1t'].max()
-
-            f.write(f"{op:20s}: Avg={avg_speedup:.2f}×, "
-                    f"Best={best_speedup:.2f}× ({best_assignment})\n")
-
-    f.write("\n")
-
-    # P-core vs E-core comparison
-    f.write("P-cores vs E-cores (8 threads, Huge scale, relative performance):\n")
-    f.write("-" * 70 + "\n")
-    for op in sorted(df['operation'].unique()):
-        op_data = huge_8t[huge_8t['operation'] == op]
-        p_speedup = op_data[op_data['assignment'] == 'p_cores']['speedup_vs_1t'].mean()
-        e_speedup = op_data[op_data['assignment'] == 'e_cores']['speedup_vs_1t'].mean()
-
-        if pd.notna(p_speedup) and pd.notna(e_speedup) and e_speedup > 0:
-            ratio = p_speedup / e_speedup
-            if ratio > 1.0:
-                winner = "P-cores"
-                margin = ((ratio - 1) * 100)
+    # Figure 5 payload: thread scaling per scale for the selected operations
+    scaling = []
+    for op in selected_ops:
+        op_default = speedup_by_cell.xs((op, 'default'), level=('operation', 'assignment'))
+        by_scale = []
+        for scale in ['Small', 'Medium', 'Large', 'VeryLarge', 'Huge']:
+            scale_speedups = op_default[scale].dropna()
+            if len(scale_speedups) > 0:
+                by_scale.append((scale, scale_speedups.index.values, scale_speedups.values))
+        scaling.append((op, complexity_by_op[op], by_scale))
+
+    renders = [
+        (render_speedup_curves, (curves,), output_dir / 'speedup_curves_all_ops.png'),
+        (render_core_assignment, (operations, speedups_default, speedups_p, speedups_e),
+         output_dir / 'core_assignment_comparison.png'),
+        (render_efficiency_heatmap, (pivot_eff,), output_dir / 'efficiency_heatmap.png'),
+        (render_complexity_vs_speedup, (max_df,), output_dir / 'complexity_vs_speedup.png'),
+        (render_thread_scaling, (scaling,), output_dir / 'thread_scaling_comparison.png'),
+    ]
+
+    # Figures are independent: render them concurrently, report in order
+    with ProcessPoolExecutor(max_workers=min(len(renders), os.cpu_count() or 1)) as pool:
+        futures = [(pool.submit(fn, *args, path), path) for fn, args, path in renders]
+        for future, path in futures:
+            future.result()
+            print(f"Saved: {path}")
+
+    print("\nAll visualizations generated successfully!")
+
+    # ============================================================================
+    # 3. SUMMARY STATISTICS
+    # ============================================================================
+
+    print("\n" + "=" * 70)
+    print("SUMMARY STATISTICS")
+    print("=" * 70)
+    print()
+
+    with io.StringIO() as f:
+        # Overall statistics
+        f.write("OVERALL PARALLEL PERFORMANCE SUMMARY\n")
+        f.write("=" * 70 + "\n\n")
+
+        # Best speedup per operation
+        f.write("Best Speedup Achieved (any configuration):\n")
+        f.write("-" * 70 + "\n")
+        for op, best_row in best_rows.iterrows():
+            complexity = complexity_by_op[op]
+
+            f.write(f"{op:20s} (complexity {complexity:.2f}): "
+                    f"{best_row['speedup_vs_1t']:.2f}× "
+                    f"({best_row['threads']}t/{best_row['assignment']}, "
+                    f"{best_row['scale']} scale)\n")
+
+        f.write("\n")
+
+        # Average speedup at 8 threads, Huge scale
+        f.write("Speedup at 8 threads, Huge scale (10M sequences):\n")
+        f.write("-" * 70 + "\n")
+        huge_8t_ops = huge_8t_means.index.unique(level='operation')
+        for op in operations:
+            if op in huge_8t_ops:
+                op_speedups = huge_8t_means.loc[op]
+                avg_speedup = op_speedups.mean()
+                best_assignment = op_speedups.idxmax()
+                best_speedup = op_speedups.max()
+
+                f.write(f"{op:20s}: Avg={avg_speedup:.2f}×, "
+                        f"Best={best_speedup:.2f}× ({best_assignment})\n")
+
+        f.write("\n")
+
+        # P-core vs E-core comparison
+        f.write("P-cores vs E-cores (8 threads, Huge scale, relative performance):\n")
+        f.write("-" * 70 + "\n")
+        p_arr = huge_8t_wide['p_cores'].to_numpy()
+        e_arr = huge_8t_wide['e_cores'].to_numpy()
+        comparable = ~np.isnan(p_arr) & ~np.isnan(e_arr) & (e_arr > 0)
+        ratio = np.divide(p_arr, e_arr, out=np.full_like(p_arr, np.nan), where=comparable)
+        p_wins = ratio > 1.0
+        winner = np.where(p_wins, "P-cores", "E-cores")
+        margin = np.where(p_wins, (ratio - 1) * 100, (1 / ratio - 1) * 100)
+
+        for op, ok, p_speedup, e_speedup, w, m in zip(operations, comparable, p_arr, e_arr, winner, margin):
+            if ok:
+                f.write(f"{op:20s}: P={p_speedup:.2f}×, E={e_speedup:.2f}×, "
+                        f"Winner: {w} (+{m:.1f}%)\n")
+
+        (output_dir / "summary_statistics.txt").write_text(f.getvalue())
+
+    print(f"Summary statistics saved to: {output_dir / 'summary_statistics.txt'}")
+
+    # ============================================================================
+    # 4. DECISION RULES
+    # ============================================================================
+
+    print("\n" + "=" * 70)
+    print("DERIVING DECISION RULES")
+    print("=" * 70)
+    print()
+
+    with io.StringIO() as f:
+        f.write("PARALLEL OPTIMIZATION DECISION RULES\n")
+        f.write("=" * 70 + "\n\n")
+
+        f.write("Based on 600 experiments across 10 operations × 6 scales × 10 configs\n\n")
+
+        # Rule 1: Minimum batch size for parallel benefit
+        f.write("RULE 1: Minimum Batch Size for Parallel Benefit\n")
+        f.write("-" * 70 + "\n")
+
+        # First scale (in scale order) where 2 threads beat 1 thread by >10%
+        two_thread = (speedup_by_cell
+                      .xs((2, 'default'), level=('threads', 'assignment'))
+                      .reindex(index=operations, columns=scale_order))
+        beats = two_thread.to_numpy() > 1.1
+        first_scale = beats.argmax(axis=1)
+        has_benefit = beats.any(axis=1)
+
+        for op, idx, ok in zip(operations, first_scale, has_benefit):
+            if ok:
+                threshold_scale = scale_order[idx]
+                threshold_seqs = num_seqs_map[threshold_scale]
+                f.write(f"{op:20s}: >={threshold_seqs:>8d} sequences ({threshold_scale})\n")
+            else:
+                f.write(f"{op:20s}: No clear benefit observed\n")
+
+        f.write("\n")
+
+        # Rule 2: Optimal thread count by operation and scale
+        f.write("RULE 2: Optimal Thread Count (Default Assignment)\n")
+        f.write("-" * 70 + "\n")
+
+        for scale in ['Small', 'Medium', 'Large', 'VeryLarge', 'Huge']:
+            f.write(f"\n{scale} scale:\n")
+            scale_default = gb_mean.xs((scale, 'default'), level=('scale', 'assignment'))['speedup_vs_1t']
+
+            for op in operations:
+                if op in scale_default.index:
+                    op_speedups = scale_default.loc[op]
+                    best_threads = op_speedups.idxmax()
+                    f.write(f"  {op:20s}: {best_threads}t "
+                            f"({op_speedups[best_threads]:.2f}× speedup)\n")
+
+        f.write("\n")
+
+        # Rule 3: When to use P-cores vs E-cores
+        f.write("RULE 3: P-cores vs E-cores (8 threads, Huge scale)\n")
+        f.write("-" * 70 + "\n")
+
+        # argmax keeps the first maximum, so ties (and a missing default) stay on
+        # 'default'; missing explicit assignments can never win
+        candidates = huge_8t_wide.to_numpy()
+        candidates = np.column_stack([
+            np.nan_to_num(candidates[:, 0], nan=np.inf),
+            np.nan_to_num(candidates[:, 1:], nan=-np.inf),
+        ])
+        best_idx = candidates.argmax(axis=1)
+        default_arr = huge_8t_wide['default'].to_numpy()
+        best_arr = candidates[np.arange(len(operations)), best_idx]
+        has_default = default_arr > 0
+        improvement = np.divide(best_arr, default_arr, out=np.ones_like(best_arr), where=has_default)
+        improvement = (improvement - 1) * 100
+
+        for op, idx, imp in zip(operations, best_idx, improvement):
+            best_assignment = assignment_order[idx]
+            if best_assignment == 'default':
+                f.write(f"{op:20s}: Use default (no benefit from explicit assignment)\n")
             else:
-                winner = "E-cores"
-                margin = ((1/ratio - 1) * 100)
+                f.write(f"{op:20s}: Use {best_assignment} (+{imp:.1f}% vs default)\n")
 
-            f.write(f"{op:20s}: P={p_speedup:.2f}×, E={e_speedup:.2f}×, "
-                    f"Winner: {winner} (+{margin:.1f}%)\n")
+        (output_dir / "decision_rules.txt").write_text(f.getvalue())
 
-print(f"Summary statistics saved to: {output_dir / 'summary_statistics.txt'}")
+    print(f"Decision rules saved to: {output_dir / 'decision_rules.txt'}")
+
+    print("\n" + "=" * 70)
+    print("ANALYSIS COMPLETE")
+    print("=" * 70)
+    print(f"\nAll outputs saved to: {output_dir}")
+    print("\nGenerated files:")
+    print(f"  - speedup_matrices.txt")
+    print(f"  - summary_statistics.txt")
+    print(f"  - decision_rules.txt")
+    print(f"  - speedup_curves_all_ops.png")
+    print(f"  - core_assignment_comparison.png")
+    print(f"  - efficiency_heatmap.png")
+    print(f"  - complexity_vs_speedup.png")
+    print(f"  - thread_scaling_comparison.png")
 
-# ============================================================================
-# 4. DECISION RULES
-# ============================================================================
 
-print("\n" + "=" * 70)
-print("DERIVING DECISION RULES")
-print("=" * 70)
-print()
-
-with open(output_dir / "decision_rules.txt", "w") as f:
-    f.write("PARALLEL OPTIMIZATION DECISION RULES\n")
-    f.write("=" * 70 + "\n\n")
-
-    f.write("Based on 600 experiments across 10 operations × 6 scales × 10 configs\n\n")
-
-    # Rule 1: Minimum batch size for parallel benefit
-    f.write("RULE 1: Minimum Batch Size for Parallel Benefit\n")
-    f.write("-" * 70 + "\n")
-
-    for op in sorted(df['operation'].unique()):
-        op_data = df[(df['operation'] == op) & (df['threads'] == 2) & (df['assignment'] == 'default')]
-
-        # Find first scale where speedup > 1.1
-        threshold_scale = None
-        for scale in scale_order:
-            scale_data = op_data[op_data['scale'] == scale]
-            if len(scale_data) > 0 and scale_data['speedup_vs_1t'].iloc[0] > 1.1:
-                threshold_scale = scale
-                threshold_seqs = scale_data['num_sequences'].iloc[0]
-                break
-
-        if threshold_scale:
-            f.write(f"{op:20s}: >={threshold_seqs:>8d} sequences ({threshold_scale})\n")
-        else:
-            f.write(f"{op:20s}: No clear benefit observed\n")
-
-    f.write("\n")
-
-    # Rule 2: Optimal thread count by operation and scale
-    f.write("RULE 2: Optimal Thread Count (Default Assignment)\n")
-    f.write("-" * 70 + "\n")
-
-    for scale in ['Small', 'Medium', 'Large', 'VeryLarge', 'Huge']:
-        f.write(f"\n{scale} scale:\n")
-        scale_data = df[(df['scale'] == scale) & (df['assignment'] == 'default')]
-
-        for op in sorted(df['operation'].unique()):
-            op_data = scale_data[scale_data['operation'] == op]
-            if len(op_data) > 0:
-                best_row = op_data.loc[op_data['speedup_vs_1t'].idxmax()]
-                f.write(f"  {op:20s}: {best_row['threads']}t "
-                        f"({best_row['speedup_vs_1t']:.2f}× speedup)\n")
-
-    f.write("\n")
-
-    # Rule 3: When to use P-cores vs E-cores
-    f.write("RULE 3: P-cores vs E-cores (8 threads, Huge scale)\n")
-    f.write("-" * 70 + "\n")
-
-    huge_8t = df[(df['scale'] == 'Huge') & (df['threads'] == 8)]
-    for op in sorted(df['operation'].unique()):
-        op_data = huge_8t[huge_8t['operation'] == op]
-
-        default_speedup = op_data[op_data['assignment'] == 'default']['speedup_vs_1t'].mean()
-        p_speedup = op_data[op_data['assignment'] == 'p_cores']['speedup_vs_1t'].mean()
-        e_speedup = op_data[op_data['assignment'] == 'e_cores']['speedup_vs_1t'].mean()
-
-        best_assignment = 'default'
-        best_speedup = default_speedup
-
-        if pd.notna(p_speedup) and p_speedup > best_speedup:
-            best_assignment = 'p_cores'
-            best_speedup = p_speedup
-        if pd.notna(e_speedup) and e_speedup > best_speedup:
-            best_assignment = 'e_cores'
-            best_speedup = e_speedup
-
-        improvement = ((best_speedup / default_speedup - 1) * 100) if default_speedup > 0 else 0
-
-        if best_assignment == 'default':
-            f.write(f"{op:20s}: Use default (no benefit from explicit assignment)\n")
-        else:
-            f.write(f"{op:20s}: Use {best_assignment} (+{improvement:.1f}% vs default)\n")
-
-print(f"Decision rules saved to: {output_dir / 'decision_rules.txt'}")
-
-print("\n" + "=" * 70)
-print("ANALYSIS COMPLETE")
-print("=" * 70)
-print(f"\nAll outputs saved to: {output_dir}")
-print("\nGenerated files:")
-print(f"  - speedup_matrices.txt")
-print(f"  - summary_statistics.txt")
-print(f"  - decision_rules.txt")
-print(f"  - speedup_curves_all_ops.png")
-print(f"  - core_assignment_comparison.png")
-print(f"  - efficiency_heatmap.png")
-print(f"  - complexity_vs_speedup.png")
-print(f"  - thread_scaling_comparison.png")
+if __name__ == "__main__":
+    main()
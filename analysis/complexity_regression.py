@@ -6,17 +6,25 @@ Analyzes N=5 experimental data to build predictive models for NEON/parallel spee
 based on operation complexity and data scale.
 
 Usage:
-    python3 analysis/complexity_regression.py
+    python3 analysis/complexity_regression.py [--no-plots] [--output-dir DIR]
 """
 
+import argparse
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.model_selection import cross_val_score, LeaveOneOut
-from sklearn.linear_model import LinearRegression, Ridge, Lasso
-from sklearn.preprocessing import PolynomialFeatures, StandardScaler
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.linear_model import Ridge, Lasso
+from sklearn.preprocessing import PolynomialFeatures
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+from sklearn.inspection import permutation_importance
+from sklearn.pipeline import Pipeline
+from sklearn.base import BaseEstimator, RegressorMixin, TransformerMixin
 from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
 import warnings
 warnings.filterwarnings('ignore')
@@ -25,20 +33,54 @@ warnings.filterwarnings('ignore')
 sns.set_theme(style='whitegrid')
 plt.rcParams['figure.figsize'] = (12, 8)
 
+# Scales in increasing size (10^2 ... 10^7 sequences)
+SCALE_ORDER = ['tiny', 'small', 'medium', 'large', 'vlarge', 'huge']
+
+
+class LstsqRegression(RegressorMixin, BaseEstimator):
+    """Ordinary least squares solved directly with np.linalg.lstsq.
+
+    Drop-in for LinearRegression on the tiny (N x 2 / N x 5) design
+    matrices here, where sklearn's validation overhead dominates the solve.
+    """
+
+    def fit(self, X, y):
+        X1 = np.column_stack([np.ones(len(X)), X])
+        beta, *_ = np.linalg.lstsq(X1, y, rcond=None)
+        self.intercept_ = beta[0]
+        self.coef_ = beta[1:]
+        return self
+
+    def predict(self, X):
+        return X @ self.coef_ + self.intercept_
+
+
+class Standardize(TransformerMixin, BaseEstimator):
+    """Inline (X - mean) / std scaling without StandardScaler's validation.
+
+    Keeps mean_ and std_ so new data is scaled as (X_new - mean_) / std_.
+    Constant columns get std_ = 1 (as StandardScaler does), so they scale
+    to 0 instead of NaN.
+    """
+
+    def fit(self, X, y=None):
+        self.mean_ = X.mean(axis=0)
+        std = X.std(axis=0)
+        std[std == 0] = 1.0
+        self.std_ = std
+        return self
+
+    def transform(self, X):
+        return (X - self.mean_) / self.std_
+
 def load_data():
     """Load N=5 experimental data with complexity scores."""
     df = pd.read_csv('analysis/n5_complexity_data.csv')
 
-    # Encode scale numerically (log scale: 100, 1K, 10K, 100K, 1M, 10M)
-    scale_map = {
-        'tiny': 2,      # 10^2
-        'small': 3,     # 10^3
-        'medium': 4,    # 10^4
-        'large': 5,     # 10^5
-        'vlarge': 6,    # 10^6
-        'huge': 7       # 10^7
-    }
-    df['scale_log10'] = df['scale'].map(scale_map)
+    # Encode scale numerically (log scale: 100, 1K, 10K, 100K, 1M, 10M) from
+    # the ordered categorical codes: tiny -> 2 (10^2) ... huge -> 7 (10^7)
+    df['scale'] = pd.Categorical(df['scale'], categories=SCALE_ORDER, ordered=True)
+    df['scale_log10'] = df['scale'].cat.codes.to_numpy() + 2
 
     # Filter out encoding-limited operation (reverse complement is outlier)
     df_filtered = df[df['operation'] != 'reverse_complement'].copy()
@@ -50,7 +92,7 @@ def load_data():
     return df, df_filtered
 
 
-def exploratory_analysis(df, df_filtered):
+def exploratory_analysis(df, df_filtered, output_dir, plots=True):
     """Exploratory data analysis and visualization."""
     print("\n" + "="*80)
     print("EXPLORATORY DATA ANALYSIS")
@@ -58,8 +100,8 @@ def exploratory_analysis(df, df_filtered):
 
     # Summary statistics
     print("\nComplexity scores:")
-    complexity_summary = df.groupby('operation')['complexity_score'].first().sort_values()
-    for op, score in complexity_summary.items():
+    complexity_summary = df.drop_duplicates('operation').sort_values('complexity_score')
+    for op, score in zip(complexity_summary['operation'], complexity_summary['complexity_score']):
         print(f"  {op:25s}: {score:.3f}")
 
     print("\nNEON speedup by operation (mean across scales):")
@@ -73,15 +115,16 @@ def exploratory_analysis(df, df_filtered):
     corr = df_filtered[corr_cols].corr()
     print(corr)
 
+    if not plots:
+        return
+
     # Visualizations
     fig, axes = plt.subplots(2, 2, figsize=(14, 10))
 
     # 1. Complexity vs NEON speedup (all scales)
     ax = axes[0, 0]
-    for operation in df_filtered['operation'].unique():
-        op_data = df_filtered[df_filtered['operation'] == operation]
-        ax.scatter(op_data['complexity_score'], op_data['neon_speedup'],
-                   label=operation, alpha=0.7, s=100)
+    sns.scatterplot(data=df_filtered, x='complexity_score', y='neon_speedup',
+                    hue='operation', alpha=0.7, s=100, ax=ax)
     ax.set_xlabel('Complexity Score')
     ax.set_ylabel('NEON Speedup (×)')
     ax.set_title('Complexity vs NEON Speedup (All Scales)')
@@ -90,10 +133,8 @@ def exploratory_analysis(df, df_filtered):
 
     # 2. Scale vs NEON speedup (by operation)
     ax = axes[0, 1]
-    for operation in df_filtered['operation'].unique():
-        op_data = df_filtered[df_filtered['operation'] == operation]
-        ax.plot(op_data['scale_log10'], op_data['neon_speedup'],
-                marker='o', label=operation, linewidth=2)
+    sns.lineplot(data=df_filtered, x='scale_log10', y='neon_speedup',
+                 hue='operation', marker='o', linewidth=2, ax=ax)
     ax.set_xlabel('Scale (log10 sequences)')
     ax.set_ylabel('NEON Speedup (×)')
     ax.set_title('Scale-Dependent NEON Speedup')
@@ -103,9 +144,8 @@ def exploratory_analysis(df, df_filtered):
     # 3. Complexity vs Parallel speedup at large scale
     ax = axes[1, 0]
     large_data = df_filtered[df_filtered['scale'] == 'large']
-    for _, row in large_data.iterrows():
-        ax.scatter(row['complexity_score'], row['parallel_speedup'],
-                   label=row['operation'], alpha=0.7, s=150)
+    sns.scatterplot(data=large_data, x='complexity_score', y='parallel_speedup',
+                    hue='operation', alpha=0.7, s=150, ax=ax)
     ax.set_xlabel('Complexity Score')
     ax.set_ylabel('Parallel Speedup (×) at 100K')
     ax.set_title('Complexity vs Parallel Speedup (Large Scale)')
@@ -114,109 +154,81 @@ def exploratory_analysis(df, df_filtered):
 
     # 4. Heatmap: Operation × Scale → NEON speedup
     ax = axes[1, 1]
-    pivot = df_filtered.pivot_table(values='neon_speedup',
-                                     index='operation',
-                                     columns='scale',
-                                     aggfunc='first')
+    # (operation, scale) is unique, so a plain pivot skips the groupby/agg path
+    pivot = df_filtered.pivot(index='operation', columns='scale', values='neon_speedup')
     sns.heatmap(pivot, annot=True, fmt='.1f', cmap='YlOrRd', ax=ax, cbar_kws={'label': 'NEON Speedup (×)'})
     ax.set_title('NEON Speedup Heatmap: Operation × Scale')
     ax.set_xlabel('Scale')
     ax.set_ylabel('Operation')
 
     plt.tight_layout()
-    plt.savefig('analysis/complexity_exploratory.png', dpi=300, bbox_inches='tight')
-    print("\n✅ Saved exploratory plots to: analysis/complexity_exploratory.png")
+    out_path = output_dir / 'complexity_exploratory.png'
+    plt.savefig(out_path, dpi=300, bbox_inches='tight')
+    print(f"\n✅ Saved exploratory plots to: {out_path}")
 
 
-def build_models(df_filtered):
+def build_models(X, y_neon):
     """Build and evaluate regression models."""
     print("\n" + "="*80)
     print("REGRESSION MODEL BUILDING")
     print("="*80)
 
-    # Prepare data
-    X = df_filtered[['complexity_score', 'scale_log10']].values
-    y_neon = df_filtered['neon_speedup'].values
-    y_parallel = df_filtered['parallel_speedup'].values
-
-    # Standardize features
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
+    # Preprocessing lives inside each Pipeline, so callers always predict
+    # from raw (complexity, scale_log10) features and CV refits the scaler
+    # per fold. Tree models don't need scaling.
+    # (key, comparison label, heading, pipeline)
+    candidates = [
+        ('linear', 'Linear', 'Linear Regression (NEON speedup)',
+         Pipeline([('scaler', Standardize()), ('est', LstsqRegression())])),
+        ('polynomial', 'Polynomial (deg=2)', 'Polynomial Regression (degree=2, NEON speedup)',
+         Pipeline([('scaler', Standardize()),
+                   ('poly', PolynomialFeatures(degree=2, include_bias=False)),
+                   ('est', LstsqRegression())])),
+        ('random_forest', 'Random Forest', 'Random Forest Regressor (NEON speedup)',
+         Pipeline([('est', RandomForestRegressor(n_estimators=100, max_depth=5, random_state=42, n_jobs=-1))])),
+        ('gradient_boosting', 'Gradient Boosting', 'Gradient Boosting Regressor (NEON speedup)',
+         # min_samples_leaf=1 matches the classic GradientBoostingRegressor;
+         # the histogram default of 20 is too coarse for ~50 points
+         Pipeline([('est', HistGradientBoostingRegressor(max_iter=100, max_depth=3, min_samples_leaf=1,
+                                                         random_state=42))])),
+    ]
 
     models = {}
-
-    # 1. Linear Regression
-    print("\n1. Linear Regression (NEON speedup)")
-    lr = LinearRegression()
-    lr.fit(X_scaled, y_neon)
-    y_pred_lr = lr.predict(X_scaled)
-    r2_lr = r2_score(y_neon, y_pred_lr)
-    mae_lr = mean_absolute_error(y_neon, y_pred_lr)
-
-    # Cross-validation
-    cv_scores_lr = cross_val_score(lr, X_scaled, y_neon, cv=5, scoring='r2')
-
-    print(f"   R² score: {r2_lr:.3f}")
-    print(f"   MAE: {mae_lr:.2f}×")
-    print(f"   Cross-val R² (mean): {cv_scores_lr.mean():.3f} ± {cv_scores_lr.std():.3f}")
-    print(f"   Coefficients: complexity={lr.coef_[0]:.2f}, scale={lr.coef_[1]:.2f}")
-    print(f"   Intercept: {lr.intercept_:.2f}")
-
-    models['linear'] = (lr, scaler, r2_lr, mae_lr)
-
-    # 2. Polynomial Regression (degree 2)
-    print("\n2. Polynomial Regression (degree=2, NEON speedup)")
-    poly = PolynomialFeatures(degree=2, include_bias=False)
-    X_poly = poly.fit_transform(X_scaled)
-
-    lr_poly = LinearRegression()
-    lr_poly.fit(X_poly, y_neon)
-    y_pred_poly = lr_poly.predict(X_poly)
-    r2_poly = r2_score(y_neon, y_pred_poly)
-    mae_poly = mean_absolute_error(y_neon, y_pred_poly)
-
-    cv_scores_poly = cross_val_score(lr_poly, X_poly, y_neon, cv=5, scoring='r2')
-
-    print(f"   R² score: {r2_poly:.3f}")
-    print(f"   MAE: {mae_poly:.2f}×")
-    print(f"   Cross-val R² (mean): {cv_scores_poly.mean():.3f} ± {cv_scores_poly.std():.3f}")
-    print(f"   Features: {poly.get_feature_names_out(['complexity', 'scale'])}")
-
-    models['polynomial'] = (lr_poly, (scaler, poly), r2_poly, mae_poly)
-
-    # 3. Random Forest
-    print("\n3. Random Forest Regressor (NEON speedup)")
-    rf = RandomForestRegressor(n_estimators=100, max_depth=5, random_state=42)
-    rf.fit(X, y_neon)  # RF doesn't need scaling
-    y_pred_rf = rf.predict(X)
-    r2_rf = r2_score(y_neon, y_pred_rf)
-    mae_rf = mean_absolute_error(y_neon, y_pred_rf)
-
-    cv_scores_rf = cross_val_score(rf, X, y_neon, cv=5, scoring='r2')
-
-    print(f"   R² score: {r2_rf:.3f}")
-    print(f"   MAE: {mae_rf:.2f}×")
-    print(f"   Cross-val R² (mean): {cv_scores_rf.mean():.3f} ± {cv_scores_rf.std():.3f}")
-    print(f"   Feature importances: complexity={rf.feature_importances_[0]:.3f}, scale={rf.feature_importances_[1]:.3f}")
-
-    models['random_forest'] = (rf, None, r2_rf, mae_rf)
-
-    # 4. Gradient Boosting
-    print("\n4. Gradient Boosting Regressor (NEON speedup)")
-    gb = GradientBoostingRegressor(n_estimators=100, max_depth=3, random_state=42)
-    gb.fit(X, y_neon)
-    y_pred_gb = gb.predict(X)
-    r2_gb = r2_score(y_neon, y_pred_gb)
-    mae_gb = mean_absolute_error(y_neon, y_pred_gb)
-
-    cv_scores_gb = cross_val_score(gb, X, y_neon, cv=5, scoring='r2')
-
-    print(f"   R² score: {r2_gb:.3f}")
-    print(f"   MAE: {mae_gb:.2f}×")
-    print(f"   Cross-val R² (mean): {cv_scores_gb.mean():.3f} ± {cv_scores_gb.std():.3f}")
-    print(f"   Feature importances: complexity={gb.feature_importances_[0]:.3f}, scale={gb.feature_importances_[1]:.3f}")
-
-    models['gradient_boosting'] = (gb, None, r2_gb, mae_gb)
+    cv_scores = {}
+
+    for i, (name, _, heading, model) in enumerate(candidates, 1):
+        print(f"\n{i}. {heading}")
+        model.fit(X, y_neon)
+        y_pred = model.predict(X)
+        r2 = r2_score(y_neon, y_pred)
+        mae = mean_absolute_error(y_neon, y_pred)
+
+        # Cross-validation
+        cv = cross_val_score(model, X, y_neon, cv=5, scoring='r2', n_jobs=-1)
+
+        print(f"   R² score: {r2:.3f}")
+        print(f"   MAE: {mae:.2f}×")
+        print(f"   Cross-val R² (mean): {cv.mean():.3f} ± {cv.std():.3f}")
+        est = model.named_steps['est']
+        if name == 'linear':
+            print(f"   Coefficients: complexity={est.coef_[0]:.2f}, scale={est.coef_[1]:.2f}")
+            print(f"   Intercept: {est.intercept_:.2f}")
+        elif name == 'polynomial':
+            print(f"   Features: {model.named_steps['poly'].get_feature_names_out(['complexity', 'scale'])}")
+        elif hasattr(est, 'feature_importances_'):
+            print(f"   Feature importances: complexity={est.feature_importances_[0]:.3f}, scale={est.feature_importances_[1]:.3f}")
+        else:
+            # Histogram boosting has no impurity importances; permute instead,
+            # normalized (negatives clipped) to sum to 1 like the forest's
+            importances = permutation_importance(model, X, y_neon, n_repeats=10, random_state=42).importances_mean
+            importances = np.clip(importances, 0, None)
+            if importances.sum() > 0:
+                importances /= importances.sum()
+            print(f"   Feature importances (permutation, normalized): "
+                  f"complexity={importances[0]:.3f}, scale={importances[1]:.3f}")
+
+        models[name] = (model, r2, mae)
+        cv_scores[name] = cv
 
     # Model comparison
     print("\n" + "="*80)
@@ -224,29 +236,27 @@ def build_models(df_filtered):
     print("="*80)
     print(f"\n{'Model':<20} {'R² Score':<12} {'MAE (×)':<12} {'Cross-Val R²'}")
     print("-" * 60)
-    print(f"{'Linear':<20} {r2_lr:<12.3f} {mae_lr:<12.2f} {cv_scores_lr.mean():.3f} ± {cv_scores_lr.std():.3f}")
-    print(f"{'Polynomial (deg=2)':<20} {r2_poly:<12.3f} {mae_poly:<12.2f} {cv_scores_poly.mean():.3f} ± {cv_scores_poly.std():.3f}")
-    print(f"{'Random Forest':<20} {r2_rf:<12.3f} {mae_rf:<12.2f} {cv_scores_rf.mean():.3f} ± {cv_scores_rf.std():.3f}")
-    print(f"{'Gradient Boosting':<20} {r2_gb:<12.3f} {mae_gb:<12.2f} {cv_scores_gb.mean():.3f} ± {cv_scores_gb.std():.3f}")
+    for name, label, *_ in candidates:
+        _, r2, mae = models[name]
+        cv = cv_scores[name]
+        print(f"{label:<20} {r2:<12.3f} {mae:<12.2f} {cv.mean():.3f} ± {cv.std():.3f}")
 
     # Choose best model
-    best_model_name = max(models, key=lambda k: models[k][2])
-    print(f"\n✅ Best model: {best_model_name} (R² = {models[best_model_name][2]:.3f})")
+    best_model_name = max(models, key=lambda k: models[k][1])
+    print(f"\n✅ Best model: {best_model_name} (R² = {models[best_model_name][1]:.3f})")
 
     return models
 
 
-def prediction_analysis(df_filtered, models):
+def prediction_analysis(df_filtered, models, X, y_actual, output_dir, plots=True):
     """Analyze predictions vs actual values."""
     print("\n" + "="*80)
     print("PREDICTION ANALYSIS")
     print("="*80)
 
     # Use best model (gradient boosting)
-    gb, _, _, _ = models['gradient_boosting']
+    gb, _, _ = models['gradient_boosting']
 
-    X = df_filtered[['complexity_score', 'scale_log10']].values
-    y_actual = df_filtered['neon_speedup'].values
     y_pred = gb.predict(X)
 
     df_filtered['neon_predicted'] = y_pred
@@ -258,9 +268,12 @@ def prediction_analysis(df_filtered, models):
     print(f"{'Operation':<25} {'Scale':<10} {'Actual':<10} {'Predicted':<12} {'Error (%)'}")
     print("-" * 80)
 
-    for _, row in df_filtered.iterrows():
-        print(f"{row['operation']:<25} {row['scale']:<10} {row['neon_speedup']:>8.2f}× "
-              f"{row['neon_predicted']:>10.2f}× {row['neon_error_pct']:>10.1f}%")
+    print("\n".join(
+        f"{op:<25} {scale:<10} {actual:>8.2f}× {pred:>10.2f}× {err:>10.1f}%"
+        for op, scale, actual, pred, err in zip(
+            df_filtered['operation'].to_numpy(), df_filtered['scale'].to_numpy(),
+            y_actual, y_pred, df_filtered['neon_error_pct'].to_numpy())
+    ))
 
     # Prediction accuracy
     within_20pct = (df_filtered['neon_error_pct'].abs() <= 20).sum()
@@ -271,15 +284,16 @@ def prediction_analysis(df_filtered, models):
     print(f"  Within 20%: {within_20pct}/{total} ({within_20pct/total*100:.1f}%)")
     print(f"  Within 50%: {within_50pct}/{total} ({within_50pct/total*100:.1f}%)")
 
+    if not plots:
+        return
+
     # Visualization
     fig, axes = plt.subplots(1, 2, figsize=(14, 6))
 
     # 1. Predicted vs Actual
     ax = axes[0]
-    for operation in df_filtered['operation'].unique():
-        op_data = df_filtered[df_filtered['operation'] == operation]
-        ax.scatter(op_data['neon_speedup'], op_data['neon_predicted'],
-                   label=operation, alpha=0.7, s=100)
+    sns.scatterplot(data=df_filtered, x='neon_speedup', y='neon_predicted',
+                    hue='operation', alpha=0.7, s=100, ax=ax)
 
     # Perfect prediction line
     min_val = min(y_actual.min(), y_pred.min())
@@ -302,8 +316,9 @@ def prediction_analysis(df_filtered, models):
     ax.grid(True, alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig('analysis/complexity_predictions.png', dpi=300, bbox_inches='tight')
-    print("\n✅ Saved prediction plots to: analysis/complexity_predictions.png")
+    out_path = output_dir / 'complexity_predictions.png'
+    plt.savefig(out_path, dpi=300, bbox_inches='tight')
+    print(f"\n✅ Saved prediction plots to: {out_path}")
 
 
 def predict_new_operations(models):
@@ -312,7 +327,7 @@ def predict_new_operations(models):
     print("PREDICTIONS FOR HYPOTHETICAL OPERATIONS")
     print("="*80)
 
-    gb, _, _, _ = models['gradient_boosting']
+    gb, _, _ = models['gradient_boosting']
 
     # Define hypothetical operations
     hypothetical = [
@@ -324,13 +339,11 @@ def predict_new_operations(models):
         ("High complexity", 0.75, "large"),
     ]
 
-    scale_map = {'tiny': 2, 'small': 3, 'medium': 4, 'large': 5, 'vlarge': 6, 'huge': 7}
-
     print(f"\n{'Operation':<45} {'Complexity':<12} {'Scale':<10} {'Predicted NEON Speedup'}")
     print("-" * 90)
 
     for op_name, complexity, scale in hypothetical:
-        scale_val = scale_map[scale]
+        scale_val = SCALE_ORDER.index(scale) + 2
         X_new = np.array([[complexity, scale_val]])
         y_pred = gb.predict(X_new)[0]
         print(f"{op_name:<45} {complexity:<12.2f} {scale:<10} {y_pred:>8.2f}×")
@@ -338,6 +351,16 @@ def predict_new_operations(models):
 
 def main():
     """Main analysis pipeline."""
+    parser = argparse.ArgumentParser(description="Complexity-speedup regression analysis")
+    parser.add_argument('--no-plots', action='store_true',
+                        help="skip figure generation (e.g. for batch/CI runs)")
+    parser.add_argument('--output-dir', type=Path, default=Path('analysis'),
+                        help="directory for generated figures (default: analysis)")
+    args = parser.parse_args()
+    plots = not args.no_plots
+    if plots:
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+
     print("\n" + "="*80)
     print("COMPLEXITY-SPEEDUP REGRESSION ANALYSIS")
     print("N=5 Operations: base_counting, gc_content, n_content, quality_aggregation")
@@ -348,13 +371,17 @@ def main():
     df, df_filtered = load_data()
 
     # Exploratory analysis
-    exploratory_analysis(df, df_filtered)
+    exploratory_analysis(df, df_filtered, args.output_dir, plots)
+
+    # Feature matrix and target, materialized once for all models
+    X = df_filtered[['complexity_score', 'scale_log10']].to_numpy()
+    y_neon = df_filtered['neon_speedup'].to_numpy()
 
     # Build models
-    models = build_models(df_filtered)
+    models = build_models(X, y_neon)
 
     # Prediction analysis
-    prediction_analysis(df_filtered, models)
+    prediction_analysis(df_filtered, models, X, y_neon, args.output_dir, plots)
 
     # Predict hypothetical operations
     predict_new_operations(models)
@@ -362,9 +389,10 @@ def main():
     print("\n" + "="*80)
     print("ANALYSIS COMPLETE")
     print("="*80)
-    print("\nGenerated files:")
-    print("  - analysis/complexity_exploratory.png (exploratory plots)")
-    print("  - analysis/complexity_predictions.png (prediction analysis)")
+    if plots:
+        print("\nGenerated files:")
+        print(f"  - {args.output_dir / 'complexity_exploratory.png'} (exploratory plots)")
+        print(f"  - {args.output_dir / 'complexity_predictions.png'} (prediction analysis)")
     print("\nNext steps:")
     print("  1. Review model performance (R² > 0.6 target)")
     print("  2. Identify outliers and anomalies")
@@ -16,8 +16,13 @@ Example:
 """
 
 import sys
+from collections import defaultdict
 from pathlib import Path
-import csv
+
+import pandas as pd
+
+# Rows parsed per read_csv chunk
+CHUNK_ROWS = 1_000_000
 
 def extract_mac_baseline(power_csv_path, output_path):
     """Extract Mac baseline data for Graviton comparison."""
@@ -40,24 +45,30 @@ def extract_mac_baseline(power_csv_path, output_path):
     # Will map to Graviton's Medium and Large
     target_scales = {'Medium', 'Large'}
 
-    baseline = []
-
-    with open(power_csv_path, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if (row['operation'] in target_operations and
-                row['config'] in target_configs and
-                row['scale'] in target_scales):
-                baseline.append(row)
-
-    # Write baseline CSV
-    if baseline:
-        with open(output_path, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=baseline[0].keys())
-            writer.writeheader()
-            writer.writerows(baseline)
-
-        print(f"Extracted {len(baseline)} Mac baseline experiments", file=sys.stderr)
+    # Read passthrough columns as text so values (e.g. "60.000") are written
+    # back exactly as the pilot recorded them; the filter columns are
+    # categorical so isin only tests each distinct label once
+    dtypes = defaultdict(lambda: str, operation='category', config='category', scale='category')
+
+    # Stream the pilot in chunks so peak memory is bounded by CHUNK_ROWS
+    # rather than the size of the input file
+    extracted = 0
+    with pd.read_csv(power_csv_path, dtype=dtypes, keep_default_na=False,
+                     chunksize=CHUNK_ROWS) as reader:
+        for chunk in reader:
+            mask = (chunk['operation'].isin(target_operations) &
+                    chunk['config'].isin(target_configs) &
+                    chunk['scale'].isin(target_scales))
+            if not mask.any():
+                continue
+
+            # Write baseline CSV (header with the first matching chunk)
+            chunk.loc[mask].to_csv(output_path, mode='a' if extracted else 'w',
+                                   header=not extracted, index=False, lineterminator='\r\n')
+            extracted += int(mask.sum())
+
+    if extracted:
+        print(f"Extracted {extracted} Mac baseline experiments", file=sys.stderr)
         print(f"Output: {output_path}", file=sys.stderr)
     else:
         print("No matching experiments found", file=sys.stderr)
@@ -8,62 +8,118 @@ This script:
 3. Generates FINDINGS.md document
 
 Usage:
-    python analysis/generate_graviton_findings.py <comparison_csv>
+    python analysis/generate_graviton_findings.py [--force] <comparison_csv>
 
 Example:
     python analysis/generate_graviton_findings.py \
         results/cross_platform_graviton/mac_vs_graviton_comparison.csv
 """
 
+import argparse
 import sys
+from itertools import groupby
+from operator import attrgetter
 from pathlib import Path
-import csv
-from collections import defaultdict
+
+from _findings_common import MarkdownBuffer, is_up_to_date, load_csv, ordered_rows, record_source
+
+# Measurement columns, declared float64 so read_csv skips type inference
+NUMERIC = ('mac_speedup', 'graviton_speedup', 'portability_ratio', 'speedup_variance_pct')
+
+# Static report text; the data-driven sections are written between these
+FINDINGS_HEADER = """\
+# Cross-Platform Validation: AWS Graviton 3 vs Mac M4
+
+**Date**: November 2, 2025
+**Experiment**: Portability Pillar Validation
+**Lab Notebook**: Entry 021
+
+---
+
+## Executive Summary
+
+**Total comparisons**: {total}
+**Operations tested**: {n_operations}
+**Platforms**: Mac M4 (10 cores) vs Graviton 3 (4 vCPUs)
+
+"""
+
+PLATFORM_SECTION = """\
+## Platform Comparison
+
+### Hardware Specifications
+
+| Platform | Processor | Cores/vCPUs | RAM | Clock |
+|----------|-----------|-------------|-----|-------|
+| Mac M4 | Apple M4 (ARM) | 10 (4P + 6E) | 24 GB | ~4.0 GHz |
+| Graviton 3 | AWS Neoverse V1 | 4 vCPUs | 8 GB | ~2.6 GHz |
+
+### Portability Analysis
+
+"""
+
+CLAIM_SECTION = """\
+## Validation of Portability Claim
+
+**Current claim** (from DEMOCRATIZING_BIOINFORMATICS_COMPUTE.md):
+- ARM NEON rules work across Mac, Graviton, Ampere, Raspberry Pi
+- Code once, deploy anywhere (ARM ecosystem)
+- No vendor lock-in
+
+**This experiment validates**:
+"""
+
+FINDINGS_FOOTER = """\
+## Next Steps
+
+### Additional Validation
+
+1. **Raspberry Pi 5**: Test on consumer ARM hardware ($80)
+2. **Ampere Altra**: Test on ARM server (bare metal)
+3. **Azure Cobalt**: Test on Microsoft ARM VMs
+
+### Publication Impact
+
+**Portability pillar now validated**:
+- Mac M4 + Graviton 3 prove ARM NEON portability
+- No vendor lock-in (works across Apple, AWS platforms)
+- Enables flexible deployment:
+  - Develop locally on Mac (one-time cost)
+  - Deploy to Graviton cloud (pay-as-you-go)
+  - Burst to cloud when needed
+
+---
+
+**Generated**: November 2, 2025
+**Data source**: {source}
+"""
 
 def load_comparison_csv(csv_path):
-    """Load comparison CSV."""
-    data = []
-    with open(csv_path, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Convert numeric fields
-            row['mac_throughput'] = float(row['mac_throughput'])
-            row['mac_speedup'] = float(row['mac_speedup'])
-            row['graviton_throughput'] = float(row['graviton_throughput'])
-            row['graviton_speedup'] = float(row['graviton_speedup'])
-            row['portability_ratio'] = float(row['portability_ratio'])
-            row['speedup_variance_pct'] = float(row['speedup_variance_pct'])
-            row['graviton_vs_mac_throughput'] = float(row['graviton_vs_mac_throughput'])
-            data.append(row)
-    return data
+    """Load comparison CSV into a DataFrame."""
+    return load_csv(csv_path, NUMERIC)
 
 def generate_findings(comparison, output_path, csv_path):
     """Generate FINDINGS.md document."""
 
-    # Group by operation
-    by_operation = defaultdict(list)
-    for exp in comparison:
-        by_operation[exp['operation']].append(exp)
+    # Invariants used in the header and footer
+    source_name = Path(csv_path).name
+    n_comparisons = len(comparison)
+    n_operations = comparison['operation'].nunique()
 
-    with open(output_path, 'w') as f:
-        f.write("# Cross-Platform Validation: AWS Graviton 3 vs Mac M4\n\n")
-        f.write("**Date**: November 2, 2025\n")
-        f.write("**Experiment**: Portability Pillar Validation\n")
-        f.write("**Lab Notebook**: Entry 021\n\n")
-        f.write("---\n\n")
+    # Summary statistics, computed once and reused by every section below
+    neon_single = comparison[comparison['config'] == 'neon']
+    if not neon_single.empty:
+        avg_ratio, min_ratio, max_ratio = neon_single['portability_ratio'].agg(['mean', 'min', 'max'])
 
-        f.write("## Executive Summary\n\n")
-        f.write(f"**Total comparisons**: {len(comparison)}\n")
-        f.write(f"**Operations tested**: {len(by_operation)}\n")
-        f.write(f"**Platforms**: Mac M4 (10 cores) vs Graviton 3 (4 vCPUs)\n\n")
+    parallel_data = comparison[comparison['config'] == 'neon_4t']
+    if not parallel_data.empty:
+        mac_4t_avg, graviton_4t_avg = parallel_data[['mac_speedup', 'graviton_speedup']].mean()
 
-        # Calculate overall portability for NEON single-threaded
-        neon_single = [c for c in comparison if c['config'] == 'neon']
-        if neon_single:
-            avg_ratio = sum(c['portability_ratio'] for c in neon_single) / len(neon_single)
-            min_ratio = min(c['portability_ratio'] for c in neon_single)
-            max_ratio = max(c['portability_ratio'] for c in neon_single)
+    with MarkdownBuffer() as f:
+        f.write(FINDINGS_HEADER.format(total=n_comparisons, n_operations=n_operations))
 
+        # Overall portability for NEON single-threaded
+        if not neon_single.empty:
             f.write(f"**Key Finding**: Portability Ratio = {avg_ratio:.2f}\n")
             f.write(f"- Range: {min_ratio:.2f} - {max_ratio:.2f}\n")
             f.write(f"- Expected: 0.8 - 1.2 (within ±20%)\n")
@@ -74,48 +130,28 @@ def generate_findings(comparison, output_path, csv_path):
         # Per-operation analysis
         f.write("## Results by Operation\n\n")
 
-        for operation, op_data in sorted(by_operation.items()):
+        rows = ordered_rows(comparison)
+        for operation, op_data in groupby(rows, key=attrgetter('operation')):
             f.write(f"### {operation}\n\n")
 
-            # Group by scale
-            by_scale = defaultdict(list)
-            for exp in op_data:
-                by_scale[exp['scale']].append(exp)
-
-            for scale, scale_data in sorted(by_scale.items()):
-                f.write(f"**{scale} scale** ({scale_data[0]['num_sequences']} sequences):\n\n")
-
-                # Table header
-                f.write("| Config | Mac Speedup | Graviton Speedup | Portability Ratio | Variance % |\n")
-                f.write("|--------|-------------|------------------|-------------------|------------|\n")
+            for scale, scale_data in groupby(op_data, key=attrgetter('scale')):
+                scale_data = list(scale_data)
+                f.write(f"**{scale} scale** ({scale_data[0].num_sequences} sequences):\n\n")
 
-                # Sort by config order
-                config_order = {'naive': 0, 'neon': 1, 'neon_4t': 2}
-                for exp in sorted(scale_data, key=lambda e: config_order.get(e['config'], 99)):
-                    f.write(f"| {exp['config']:8s} | {exp['mac_speedup']:6.1f}× | ")
-                    f.write(f"{exp['graviton_speedup']:6.1f}× | ")
-                    f.write(f"{exp['portability_ratio']:6.2f} | ")
-                    f.write(f"{exp['speedup_variance_pct']:+7.1f}% |\n")
-
-                f.write("\n")
+                f.table("| Config | Mac Speedup | Graviton Speedup | Portability Ratio | Variance % |",
+                        "|--------|-------------|------------------|-------------------|------------|",
+                        [(f"{exp.config:8s}",
+                          f"{exp.mac_speedup:6.1f}×",
+                          f"{exp.graviton_speedup:6.1f}×",
+                          f"{exp.portability_ratio:6.2f}",
+                          f"{exp.speedup_variance_pct:+7.1f}%") for exp in scale_data])
 
             f.write("---\n\n")
 
-        # Platform Comparison
-        f.write("## Platform Comparison\n\n")
-
-        f.write("### Hardware Specifications\n\n")
-        f.write("| Platform | Processor | Cores/vCPUs | RAM | Clock |\n")
-        f.write("|----------|-----------|-------------|-----|-------|\n")
-        f.write("| Mac M4 | Apple M4 (ARM) | 10 (4P + 6E) | 24 GB | ~4.0 GHz |\n")
-        f.write("| Graviton 3 | AWS Neoverse V1 | 4 vCPUs | 8 GB | ~2.6 GHz |\n\n")
-
-        f.write("### Portability Analysis\n\n")
+        f.write(PLATFORM_SECTION)
 
         # NEON portability
-        neon_data = [c for c in comparison if c['config'] == 'neon']
-        if neon_data:
-            avg_ratio = sum(c['portability_ratio'] for c in neon_data) / len(neon_data)
+        if not neon_single.empty:
             f.write(f"**NEON Portability** (single-threaded):\n")
             f.write(f"- Average ratio: {avg_ratio:.2f}\n")
             f.write(f"- Interpretation: Graviton NEON is {avg_ratio:.0%} as effective as Mac NEON\n")
@@ -123,12 +159,8 @@ def generate_findings(comparison, output_path, csv_path):
             f.write(f"- **Result**: {'✅ Within expected range' if 0.8 <= avg_ratio <= 1.2 else '⚠️ Outside range'}\n\n")
 
         # Parallel portability
-        parallel_data = [c for c in comparison if c['config'] == 'neon_4t']
-        if parallel_data:
+        if not parallel_data.empty:
             # Parallel speedups will differ due to core count
-            mac_4t_avg = sum(c['mac_speedup'] for c in parallel_data) / len(parallel_data)
-            graviton_4t_avg = sum(c['graviton_speedup'] for c in parallel_data) / len(parallel_data)
-
             f.write(f"**Parallel Portability** (4 threads):\n")
             f.write(f"- Mac NEON+4t speedup: {mac_4t_avg:.1f}× (average)\n")
             f.write(f"- Graviton NEON+4t speedup: {graviton_4t_avg:.1f}× (average)\n")
@@ -137,17 +169,9 @@ def generate_findings(comparison, output_path, csv_path):
 
         f.write("---\n\n")
 
-        # Validation of Portability Claim
-        f.write("## Validation of Portability Claim\n\n")
-        f.write("**Current claim** (from DEMOCRATIZING_BIOINFORMATICS_COMPUTE.md):\n")
-        f.write("- ARM NEON rules work across Mac, Graviton, Ampere, Raspberry Pi\n")
-        f.write("- Code once, deploy anywhere (ARM ecosystem)\n")
-        f.write("- No vendor lock-in\n\n")
-
-        f.write("**This experiment validates**:\n")
+        f.write(CLAIM_SECTION)
 
-        if neon_single:
-            avg_ratio = sum(c['portability_ratio'] for c in neon_single) / len(neon_single)
+        if not neon_single.empty:
             if 0.8 <= avg_ratio <= 1.2:
                 f.write(f"- ✅ NEON speedups transfer Mac → Graviton (ratio: {avg_ratio:.2f})\n")
                 f.write(f"- ✅ Optimization rules are portable (same code, different platform)\n")
@@ -163,47 +187,38 @@ def generate_findings(comparison, output_path, csv_path):
 
         f.write("---\n\n")
 
-        # Next Steps
-        f.write("## Next Steps\n\n")
-        f.write("### Additional Validation\n\n")
-        f.write("1. **Raspberry Pi 5**: Test on consumer ARM hardware ($80)\n")
-        f.write("2. **Ampere Altra**: Test on ARM server (bare metal)\n")
-        f.write("3. **Azure Cobalt**: Test on Microsoft ARM VMs\n\n")
-
-        f.write("### Publication Impact\n\n")
-        f.write("**Portability pillar now validated**:\n")
-        f.write("- Mac M4 + Graviton 3 prove ARM NEON portability\n")
-        f.write("- No vendor lock-in (works across Apple, AWS platforms)\n")
-        f.write("- Enables flexible deployment:\n")
-        f.write("  - Develop locally on Mac (one-time cost)\n")
-        f.write("  - Deploy to Graviton cloud (pay-as-you-go)\n")
-        f.write("  - Burst to cloud when needed\n\n")
+        f.write(FINDINGS_FOOTER.format(source=source_name))
 
-        f.write("---\n\n")
-        f.write("**Generated**: November 2, 2025\n")
-        f.write(f"**Data source**: {Path(csv_path).name}\n")
+        f.save(output_path)
 
     print(f"Generated findings: {output_path}", file=sys.stderr)
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python generate_graviton_findings.py <comparison_csv>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('comparison_csv', type=Path, help="Mac vs Graviton comparison CSV from compare_mac_graviton.py")
+    parser.add_argument('--force', action='store_true',
+                        help="regenerate FINDINGS.md even if it looks up to date")
+    args = parser.parse_args()
 
-    comparison_csv = Path(sys.argv[1])
+    comparison_csv = args.comparison_csv
 
     if not comparison_csv.exists():
         print(f"Error: Comparison CSV not found: {comparison_csv}")
         sys.exit(1)
 
+    output_path = comparison_csv.parent / "FINDINGS.md"
+    if not args.force and is_up_to_date(output_path, comparison_csv, __file__):
+        print(f"{output_path} is up to date; nothing to do", file=sys.stderr)
+        return
+
     print("Loading comparison data...", file=sys.stderr)
     comparison = load_comparison_csv(comparison_csv)
 
     print(f"Loaded {len(comparison)} comparisons", file=sys.stderr)
 
-    output_path = comparison_csv.parent / "FINDINGS.md"
     print(f"Generating findings...", file=sys.stderr)
     generate_findings(comparison, output_path, comparison_csv)
+    record_source(output_path, comparison_csv)
 
     print("", file=sys.stderr)
     print("✅ FINDINGS.md generated!", file=sys.stderr)
@@ -8,64 +8,97 @@ This script:
 3. Generates FINDINGS.md document
 
 Usage:
-    python analysis/generate_power_findings.py <enriched_csv>
+    python analysis/generate_power_findings.py [--force] <enriched_csv>
 
 Example:
     python analysis/generate_power_findings.py \
         results/phase1_power_consumption/power_enriched_20251102_143000.csv
 """
 
+import argparse
 import sys
+from itertools import groupby
+from operator import attrgetter
 from pathlib import Path
-import csv
-from collections import defaultdict
+
+from _findings_common import CONFIG_RANK, MarkdownBuffer, is_up_to_date, load_csv, ordered_rows, record_source
+
+# Numeric columns, parsed straight to float64 by the C reader
+NUMERIC = ('cpu_power_w', 'energy_wh', 'energy_per_seq_uwh',
+           'time_speedup_vs_naive', 'energy_speedup_vs_naive', 'energy_efficiency')
+
+# Fixed report prose (header, claim and footer templates)
+FINDINGS_HEADER = """\
+# Power Consumption Pilot - Findings
+
+**Date**: November 2, 2025
+**Experiment**: Environmental Pillar Validation
+**Lab Notebook**: Entry 020
+
+---
+
+## Executive Summary
+
+**Total experiments**: {total}
+**Operations tested**: {n_operations}
+**Configurations**: 4 (naive, neon, neon_4t, neon_8t)
+**Scales**: 2 (Medium 10K, Large 100K)
+
+"""
+
+CLAIM_SECTION = """\
+## Validation of "300× Less Energy" Claim
+
+**Current claim** (from DEMOCRATIZING_BIOINFORMATICS_COMPUTE.md):
+- Traditional HPC: 150 Wh (naive, 30 minutes)
+- Mac Mini optimized: 0.5 Wh (NEON+Parallel, 1 minute)
+- Reduction: 300×
+
+**Our measurements** (Mac-to-Mac comparison):
+"""
+
+FINDINGS_FOOTER = """\
+## Next Steps
+
+### Expand to Full 80 Experiments?
+
+**Decision criteria**:
+- ✅ If energy efficiency ≈ 1.0 (validated): Patterns hold, may not need full 80
+- ❌ If energy efficiency varies widely: Expand to more operations
+
+### Additional Validation
+
+1. **Test on Mac Mini M4**: Lower base power than MacBook
+2. **Measure HPC cluster**: Enable direct comparison for 300× claim
+3. **Test on real FASTQ data**: Validate synthetic results
+
+---
+
+**Generated**: November 2, 2025
+**Data source**: {source}
+"""
 
 def load_enriched_csv(csv_path):
-    """Load enriched power consumption CSV."""
-    experiments = []
-
-    with open(csv_path, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Convert numeric fields
-            row['cpu_power_w'] = float(row['cpu_power_w'])
-            row['energy_wh'] = float(row['energy_wh'])
-            row['energy_per_seq_uwh'] = float(row['energy_per_seq_uwh'])
-            row['time_speedup_vs_naive'] = float(row['time_speedup_vs_naive'])
-            row['energy_speedup_vs_naive'] = float(row['energy_speedup_vs_naive'])
-            row['energy_efficiency'] = float(row['energy_efficiency'])
-            row['throughput_seqs_per_sec'] = float(row['throughput_seqs_per_sec'])
-            experiments.append(row)
-
-    return experiments
+    """Load enriched power consumption CSV into a DataFrame."""
+    return load_csv(csv_path, NUMERIC)
 
 def generate_findings(experiments, output_path, csv_path):
     """Generate FINDINGS.md document."""
 
-    # Group by operation
-    by_operation = defaultdict(list)
-    for exp in experiments:
-        by_operation[exp['operation']].append(exp)
+    # Invariants used in the header and footer
+    source_name = Path(csv_path).name
+    n_experiments = len(experiments)
+    n_operations = experiments['operation'].nunique()
 
-    with open(output_path, 'w') as f:
-        f.write("# Power Consumption Pilot - Findings\n\n")
-        f.write("**Date**: November 2, 2025\n")
-        f.write("**Experiment**: Environmental Pillar Validation\n")
-        f.write("**Lab Notebook**: Entry 020\n\n")
-        f.write("---\n\n")
-
-        f.write("## Executive Summary\n\n")
-        f.write(f"**Total experiments**: {len(experiments)}\n")
-        f.write(f"**Operations tested**: {len(by_operation)}\n")
-        f.write(f"**Configurations**: 4 (naive, neon, neon_4t, neon_8t)\n")
-        f.write(f"**Scales**: 2 (Medium 10K, Large 100K)\n\n")
+    with MarkdownBuffer() as f:
+        f.write(FINDINGS_HEADER.format(total=n_experiments, n_operations=n_operations))
 
         # Calculate overall statistics
-        all_configs = [e for e in experiments if e['config'] != 'naive']
-        if all_configs:
-            avg_energy_efficiency = sum(e['energy_efficiency'] for e in all_configs) / len(all_configs)
-            avg_energy_speedup = sum(e['energy_speedup_vs_naive'] for e in all_configs) / len(all_configs)
-            avg_time_speedup = sum(e['time_speedup_vs_naive'] for e in all_configs) / len(all_configs)
+        all_configs = experiments[experiments['config'] != 'naive']
+        if not all_configs.empty:
+            avg_energy_efficiency, avg_energy_speedup, avg_time_speedup = all_configs[
+                ['energy_efficiency', 'energy_speedup_vs_naive', 'time_speedup_vs_naive']
+            ].mean()
 
             f.write(f"**Key Finding**: Energy scales with runtime\n")
             f.write(f"- Average time speedup: **{avg_time_speedup:.1f}×**\n")
@@ -77,28 +110,22 @@ def generate_findings(experiments, output_path, csv_path):
         # Per-operation analysis
         f.write("## Results by Operation\n\n")
 
-        for operation, op_exps in sorted(by_operation.items()):
+        rows = ordered_rows(experiments)
+        for operation, op_exps in groupby(rows, key=attrgetter('operation')):
             f.write(f"### {operation}\n\n")
 
-            # Group by scale
-            by_scale = defaultdict(list)
-            for exp in op_exps:
-                by_scale[exp['scale']].append(exp)
-
-            for scale, scale_exps in sorted(by_scale.items()):
-                f.write(f"**{scale} scale** ({scale_exps[0]['num_sequences']} sequences):\n\n")
-                f.write("| Config | CPU Power (W) | Energy (mWh) | Energy/Seq (μWh) | Time Speedup | Energy Speedup | Efficiency |\n")
-                f.write("|--------|--------------|--------------|------------------|--------------|----------------|------------|\n")
-
-                for exp in sorted(scale_exps, key=lambda e: ['naive', 'neon', 'neon_4t', 'neon_8t'].index(e['config'])):
-                    f.write(f"| {exp['config']:8s} | {exp['cpu_power_w']:6.1f} | ")
-                    f.write(f"{exp['energy_wh'] * 1000:7.3f} | ")
-                    f.write(f"{exp['energy_per_seq_uwh']:8.3f} | ")
-                    f.write(f"{exp['time_speedup_vs_naive']:6.1f}× | ")
-                    f.write(f"{exp['energy_speedup_vs_naive']:6.1f}× | ")
-                    f.write(f"{exp['energy_efficiency']:6.2f} |\n")
-
-                f.write("\n")
+            for scale, scale_exps in groupby(op_exps, key=attrgetter('scale')):
+                scale_exps = list(scale_exps)
+                f.write(f"**{scale} scale** ({scale_exps[0].num_sequences} sequences):\n\n")
+                f.table("| Config | CPU Power (W) | Energy (mWh) | Energy/Seq (μWh) | Time Speedup | Energy Speedup | Efficiency |",
+                        "|--------|--------------|--------------|------------------|--------------|----------------|------------|",
+                        [(f"{exp.config:8s}",
+                          f"{exp.cpu_power_w:6.1f}",
+                          f"{exp.energy_wh * 1000:7.3f}",
+                          f"{exp.energy_per_seq_uwh:8.3f}",
+                          f"{exp.time_speedup_vs_naive:6.1f}×",
+                          f"{exp.energy_speedup_vs_naive:6.1f}×",
+                          f"{exp.energy_efficiency:6.2f}") for exp in scale_exps])
 
             f.write("---\n\n")
 
@@ -107,21 +134,19 @@ def generate_findings(experiments, output_path, csv_path):
         f.write("Does optimization increase power draw per unit time?\n\n")
 
         # Average power by config
-        power_by_config = defaultdict(list)
-        for exp in experiments:
-            power_by_config[exp['config']].append(exp['cpu_power_w'])
-
-        f.write("| Configuration | Average CPU Power (W) | vs Naive |\n")
-        f.write("|---------------|----------------------|----------|\n")
+        power_by_config = experiments.groupby('config')['cpu_power_w'].mean()
 
-        naive_power = sum(power_by_config['naive']) / len(power_by_config['naive'])
-        for config in ['naive', 'neon', 'neon_4t', 'neon_8t']:
-            if config in power_by_config:
-                avg_power = sum(power_by_config[config]) / len(power_by_config[config])
+        naive_power = power_by_config['naive']
+        power_rows = []
+        for config in CONFIG_RANK:
+            if config in power_by_config.index:
+                avg_power = power_by_config[config]
                 vs_naive = avg_power / naive_power if naive_power > 0 else 0.0
-                f.write(f"| {config:14s} | {avg_power:20.1f} | {vs_naive:8.2f}× |\n")
+                power_rows.append((f"{config:14s}", f"{avg_power:20.1f}", f"{vs_naive:8.2f}×"))
 
-        f.write("\n")
+        f.table("| Configuration | Average CPU Power (W) | vs Naive |",
+                "|---------------|----------------------|----------|",
+                power_rows)
         f.write("**Insight**: Power draw increases with parallelism, but total energy decreases due to faster completion.\n\n")
 
         f.write("---\n\n")
@@ -130,10 +155,15 @@ def generate_findings(experiments, output_path, csv_path):
         f.write("## Environmental Impact Extrapolation\n\n")
 
         # Use base_counting as representative
-        base_counting_large = [e for e in experiments if e['operation'] == 'base_counting' and e['scale'] == 'Large']
-        if base_counting_large:
-            naive = next(e for e in base_counting_large if e['config'] == 'naive')
-            optimized = next(e for e in base_counting_large if e['config'] == 'neon_8t')
+        # Indexed by config once (first row per config, so a rerun appended to
+        # the pilot CSV can't make .loc return a frame); the 300× validation
+        # below reuses naive/optimized
+        base_counting_large = experiments[(experiments['operation'] == 'base_counting') &
+                                          (experiments['scale'] == 'Large')]
+        base_counting_large = base_counting_large.drop_duplicates('config').set_index('config')
+        if not base_counting_large.empty:
+            naive = base_counting_large.loc['naive']
+            optimized = base_counting_large.loc['neon_8t']
 
             energy_saved_per_analysis = naive['energy_wh'] - optimized['energy_wh']
 
@@ -158,17 +188,8 @@ def generate_findings(experiments, output_path, csv_path):
 
         f.write("---\n\n")
 
-        # Validation of 300× claim
-        f.write("## Validation of \"300× Less Energy\" Claim\n\n")
-        f.write("**Current claim** (from DEMOCRATIZING_BIOINFORMATICS_COMPUTE.md):\n")
-        f.write("- Traditional HPC: 150 Wh (naive, 30 minutes)\n")
-        f.write("- Mac Mini optimized: 0.5 Wh (NEON+Parallel, 1 minute)\n")
-        f.write("- Reduction: 300×\n\n")
-
-        f.write("**Our measurements** (Mac-to-Mac comparison):\n")
-        if base_counting_large:
-            naive = next(e for e in base_counting_large if e['config'] == 'naive')
-            optimized = next(e for e in base_counting_large if e['config'] == 'neon_8t')
+        f.write(CLAIM_SECTION)
+        if not base_counting_large.empty:
             reduction = naive['energy_wh'] / optimized['energy_wh'] if optimized['energy_wh'] > 0 else 0.0
 
             f.write(f"- Naive (Mac): {naive['energy_wh'] * 1000:.3f} mWh\n")
@@ -180,43 +201,38 @@ def generate_findings(experiments, output_path, csv_path):
 
         f.write("---\n\n")
 
-        # Next steps
-        f.write("## Next Steps\n\n")
-        f.write("### Expand to Full 80 Experiments?\n\n")
-        f.write("**Decision criteria**:\n")
-        f.write("- ✅ If energy efficiency ≈ 1.0 (validated): Patterns hold, may not need full 80\n")
-        f.write("- ❌ If energy efficiency varies widely: Expand to more operations\n\n")
+        f.write(FINDINGS_FOOTER.format(source=source_name))
 
-        f.write("### Additional Validation\n\n")
-        f.write("1. **Test on Mac Mini M4**: Lower base power than MacBook\n")
-        f.write("2. **Measure HPC cluster**: Enable direct comparison for 300× claim\n")
-        f.write("3. **Test on real FASTQ data**: Validate synthetic results\n\n")
-
-        f.write("---\n\n")
-        f.write("**Generated**: November 2, 2025\n")
-        f.write(f"**Data source**: {Path(csv_path).name}\n")
+        f.save(output_path)
 
     print(f"Generated findings: {output_path}", file=sys.stderr)
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python generate_power_findings.py <enriched_csv>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('enriched_csv', type=Path, help="enriched power CSV from parse_powermetrics.py")
+    parser.add_argument('--force', action='store_true',
+                        help="regenerate FINDINGS.md even if it looks up to date")
+    args = parser.parse_args()
 
-    enriched_csv = Path(sys.argv[1])
+    enriched_csv = args.enriched_csv
 
     if not enriched_csv.exists():
         print(f"Error: Enriched CSV not found: {enriched_csv}")
         sys.exit(1)
 
+    output_path = enriched_csv.parent / "FINDINGS.md"
+    if not args.force and is_up_to_date(output_path, enriched_csv, __file__):
+        print(f"{output_path} is up to date; nothing to do", file=sys.stderr)
+        return
+
     print("Loading enriched CSV...", file=sys.stderr)
     experiments = load_enriched_csv(enriched_csv)
 
     print(f"Loaded {len(experiments)} experiments", file=sys.stderr)
 
-    output_path = enriched_csv.parent / "FINDINGS.md"
     print(f"Generating findings...", file=sys.stderr)
     generate_findings(experiments, output_path, enriched_csv)
+    record_source(output_path, enriched_csv)
 
     print("", file=sys.stderr)
     print("✅ FINDINGS.md generated!", file=sys.stderr)
@@ -9,15 +9,25 @@ Creates 5 plots for manuscript submission:
 4. Block Size Impact (Streaming Overhead)
 5. mmap Threshold Effect
 
-Output: 300 DPI PNG + vector PDF (publication-ready)
+Output: 300 DPI PNG; add vector PDF for manuscript submission with
+    python3 analysis/generate_publication_plots.py --formats png,pdf
 """
 
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # headless: plots are only ever saved, never shown
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from matplotlib.backend_bases import FigureCanvasBase
+from matplotlib.figure import SubFigure
 import numpy as np
 from pathlib import Path
-import seaborn as sns
+
+from _cache import cached_frame
 
 # Set publication-quality style
 plt.rcParams.update({
@@ -30,7 +40,6 @@ plt.rcParams.update({
     'ytick.labelsize': 10,
     'legend.fontsize': 10,
     'figure.titlesize': 16,
-    'figure.dpi': 300,
     'savefig.dpi': 300,
     'savefig.bbox': 'tight',
     'savefig.pad_inches': 0.1,
@@ -54,18 +63,42 @@ def create_output_dir():
     output_dir.mkdir(parents=True, exist_ok=True)
     return output_dir
 
-def save_plot(fig, name, output_dir):
-    """Save plot as both PNG and PDF"""
-    png_path = output_dir / f"{name}.png"
-    pdf_path = output_dir / f"{name}.pdf"
-
-    fig.savefig(png_path, format='png', dpi=300, bbox_inches='tight')
-    fig.savefig(pdf_path, format='pdf', bbox_inches='tight')
+def reset_figure(fig, figsize):
+    """Clear the shared figure and resize it for the next plot"""
+    fig.clf()
+    fig.set_size_inches(figsize)
 
-    print(f"✓ Saved: {name}.png and {name}.pdf")
-    return png_path, pdf_path
+def overall_title(fig, title):
+    """Add a two-panel plot's overall title.
 
-def plot1_neon_speedup_by_operation(output_dir):
+    A standalone figure lifts it above the axes (the tight bbox keeps it in
+    frame); a panel of the combined figure leaves placement to its
+    constrained layout so it doesn't collide with the panel above.
+    """
+    if isinstance(fig, SubFigure):
+        fig.suptitle(title, fontsize=16, fontweight='bold')
+    else:
+        fig.suptitle(title, fontsize=16, fontweight='bold', y=1.02)
+
+def bar_tops(bars):
+    """x centers and heights of a bar container's bars, read in one pass"""
+    centers = np.array([bar.get_x() + bar.get_width()/2. for bar in bars])
+    heights = np.array([bar.get_height() for bar in bars])
+    return centers, heights
+
+def save_plot(fig, name, output_dir, formats=('png',)):
+    """Save plot in each of formats (e.g. 'png', 'pdf')"""
+    # dpi and tight bbox come from the savefig.* rcParams above
+    paths = []
+    for fmt in formats:
+        path = output_dir / f"{name}.{fmt}"
+        fig.savefig(path, format=fmt)
+        paths.append(path)
+
+    print(f"✓ Saved: {' and '.join(path.name for path in paths)}")
+    return paths
+
+def plot1_neon_speedup_by_operation(fig):
     """
     Plot 1: NEON Speedup by Operation
 
@@ -74,36 +107,44 @@ def plot1_neon_speedup_by_operation(output_dir):
     """
     print("\n=== Plot 1: NEON Speedup by Operation ===")
 
-    # Load DAG batch 1 data (NEON validation)
-    df = pd.read_csv('results/dag_statistical/batch1_neon_parallel_n30.csv')
+    csv_path = Path('results/dag_statistical/batch1_neon_parallel_n30.csv')
+
+    def build():
+        # Load DAG batch 1 data (NEON validation)
+        df = pd.read_csv(csv_path,
+                         usecols=['operation', 'config_name', 'scale', 'throughput_mean'],
+                         dtype={'operation': 'category', 'config_name': 'category',
+                                'scale': 'category', 'throughput_mean': 'float64'})
+
+        # Filter for Medium scale, NEON config only
+        df_neon = df[(df['scale'] == 'Medium') & (df['config_name'] == 'neon')]
+        df_naive = df[(df['scale'] == 'Medium') & (df['config_name'] == 'naive')]
 
-    # Filter for Medium scale, NEON config only
-    df_neon = df[(df['scale'] == 'Medium') & (df['config_name'] == 'neon')]
-    df_naive = df[(df['scale'] == 'Medium') & (df['config_name'] == 'naive')]
+        # Merge to calculate speedup
+        df_merged = df_neon.merge(
+            df_naive[['operation', 'throughput_mean']],
+            on='operation',
+            suffixes=('_neon', '_naive')
+        )
+        df_merged['speedup'] = df_merged['throughput_mean_neon'] / df_merged['throughput_mean_naive']
 
-    # Merge to calculate speedup
-    df_merged = df_neon.merge(
-        df_naive[['operation', 'throughput_mean']],
-        on='operation',
-        suffixes=('_neon', '_naive')
-    )
-    df_merged['speedup'] = df_merged['throughput_mean_neon'] / df_merged['throughput_mean_naive']
+        # Sort by speedup
+        return df_merged.sort_values('speedup', ascending=True)
 
-    # Sort by speedup
-    df_merged = df_merged.sort_values('speedup', ascending=True)
+    df_merged = cached_frame(csv_path, 'plot1', build, __file__)
 
-    # Create figure
-    fig, ax = plt.subplots(figsize=(10, 6))
+    # Create axes
+    ax = fig.subplots()
 
     # Bar plot with color gradient based on speedup
-    colors = ['#2ECC71' if s >= 10 else '#3498DB' if s >= 5 else '#95A5A6'
-              for s in df_merged['speedup']]
+    speedup = df_merged['speedup'].to_numpy()
+    colors = np.where(speedup >= 10, '#2ECC71', np.where(speedup >= 5, '#3498DB', '#95A5A6'))
 
-    bars = ax.barh(df_merged['operation'], df_merged['speedup'], color=colors, edgecolor='black', linewidth=0.5)
+    bars = ax.barh(df_merged['operation'], speedup, color=colors, edgecolor='black', linewidth=0.5)
 
     # Add speedup labels on bars
-    for i, (idx, row) in enumerate(df_merged.iterrows()):
-        ax.text(row['speedup'] + 0.5, i, f"{row['speedup']:.1f}×",
+    for i, s in enumerate(speedup):
+        ax.text(s + 0.5, i, f"{s:.1f}×",
                 va='center', ha='left', fontsize=9)
 
     # Reference line at 1× (no speedup)
@@ -114,7 +155,7 @@ def plot1_neon_speedup_by_operation(output_dir):
     ax.set_ylabel('Operation', fontweight='bold')
     ax.set_title('NEON SIMD Speedup by Operation\n(Medium scale: 10K sequences, N=30)',
                  fontweight='bold', pad=15)
-    ax.set_xlim(0, max(df_merged['speedup']) * 1.15)
+    ax.set_xlim(0, speedup.max() * 1.15)
     ax.grid(axis='x', alpha=0.3, linestyle=':', linewidth=0.5)
 
     # Legend
@@ -123,11 +164,7 @@ def plot1_neon_speedup_by_operation(output_dir):
     low_patch = mpatches.Patch(color='#95A5A6', label='Low benefit (<5×)')
     ax.legend(handles=[high_patch, med_patch, low_patch], loc='lower right')
 
-    plt.tight_layout()
-    save_plot(fig, 'plot1_neon_speedup_by_operation', output_dir)
-    plt.close()
-
-def plot2_streaming_memory_footprint(output_dir):
+def plot2_streaming_memory_footprint(fig):
     """
     Plot 2: Streaming Memory Footprint
 
@@ -135,24 +172,32 @@ def plot2_streaming_memory_footprint(output_dir):
     """
     print("\n=== Plot 2: Streaming Memory Footprint ===")
 
-    # Load streaming memory data
-    df = pd.read_csv('results/streaming/streaming_memory_v2_n30.csv')
+    # Define scale order
+    scale_order = ['Medium', 'Large', 'VeryLarge']
+
+    csv_path = Path('results/streaming/streaming_memory_v2_n30.csv')
 
-    # Aggregate by scale and pattern
-    df_agg = df.groupby(['scale', 'pattern']).agg({
-        'peak_mb': 'mean',
-        'num_sequences': 'first'
-    }).reset_index()
+    def build():
+        # Load streaming memory data
+        df = pd.read_csv(csv_path,
+                         usecols=['scale', 'pattern', 'num_sequences', 'peak_mb'],
+                         dtype={'scale': 'category', 'pattern': 'category',
+                                'num_sequences': 'int64', 'peak_mb': 'float64'})
 
-    # Pivot for easier plotting
-    df_pivot = df_agg.pivot(index='scale', columns='pattern', values='peak_mb')
+        # Aggregate by scale and pattern
+        df_agg = df.groupby(['scale', 'pattern'], observed=True).agg({
+            'peak_mb': 'mean',
+            'num_sequences': 'first'
+        }).reset_index()
 
-    # Define scale order
-    scale_order = ['Medium', 'Large', 'VeryLarge']
-    df_pivot = df_pivot.reindex(scale_order)
+        # Pivot for easier plotting, in scale order
+        df_pivot = df_agg.pivot(index='scale', columns='pattern', values='peak_mb')
+        return df_pivot.reindex(scale_order)
 
-    # Create figure
-    fig, ax = plt.subplots(figsize=(10, 6))
+    df_pivot = cached_frame(csv_path, 'plot2', build, __file__)
+
+    # Create axes
+    ax = fig.subplots()
 
     # Bar plot
     x = np.arange(len(scale_order))
@@ -167,14 +212,8 @@ def plot2_streaming_memory_footprint(output_dir):
 
     # Add value labels on bars
     for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            if height > 10:
-                label = f'{height:.0f} MB'
-            else:
-                label = f'{height:.1f} MB'
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                    label, ha='center', va='bottom', fontsize=9)
+        ax.bar_label(bars, labels=[f'{h:.0f} MB' if h > 10 else f'{h:.1f} MB' for h in bars.datavalues],
+                     padding=0, fontsize=9)
 
     # Add reduction percentage annotations
     for i, scale in enumerate(scale_order):
@@ -204,11 +243,7 @@ def plot2_streaming_memory_footprint(output_dir):
     ax.legend(loc='upper left')
     ax.grid(axis='y', alpha=0.3, linestyle=':', linewidth=0.5)
 
-    plt.tight_layout()
-    save_plot(fig, 'plot2_streaming_memory_footprint', output_dir)
-    plt.close()
-
-def plot3_io_optimization_stack(output_dir):
+def plot3_io_optimization_stack(fig):
     """
     Plot 3: I/O Optimization Stack
 
@@ -224,8 +259,8 @@ def plot3_io_optimization_stack(output_dir):
     speedup_small = [1.0, 5.48, 5.48]
     speedup_large = [1.0, 6.50, 16.3]
 
-    # Create figure with two subplots
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    # Create two subplots
+    ax1, ax2 = fig.subplots(1, 2)
 
     # --- Left subplot: Small files ---
     x = np.arange(len(optimizations))
@@ -236,14 +271,12 @@ def plot3_io_optimization_stack(output_dir):
                     edgecolor='black', linewidth=0.5)
 
     # Add speedup labels
-    for i, (bar, speedup) in enumerate(zip(bars1, speedup_small)):
-        height = bar.get_height()
-        ax1.text(bar.get_x() + bar.get_width()/2., height + 200,
+    for center, height, speedup in zip(*bar_tops(bars1), speedup_small):
+        ax1.text(center, height + 200,
                 f'{speedup:.1f}×', ha='center', va='bottom',
                 fontsize=11, fontweight='bold')
-        ax1.text(bar.get_x() + bar.get_width()/2., height/2,
-                f'{throughput_small[i]:,}\nMB/s', ha='center', va='center',
-                fontsize=9, color='white', fontweight='bold')
+    ax1.bar_label(bars1, labels=[f'{t:,}\nMB/s' for t in throughput_small], label_type='center',
+                  fontsize=9, color='white', fontweight='bold')
 
     ax1.set_ylabel('Throughput (MB/s)', fontweight='bold')
     ax1.set_title('Small Files (<50 MB)\n0.58 MB, 51 bgzip blocks',
@@ -259,14 +292,12 @@ def plot3_io_optimization_stack(output_dir):
                     edgecolor='black', linewidth=0.5)
 
     # Add speedup labels
-    for i, (bar, speedup) in enumerate(zip(bars2, speedup_large)):
-        height = bar.get_height()
-        ax2.text(bar.get_x() + bar.get_width()/2., height + 1000,
+    for center, height, speedup in zip(*bar_tops(bars2), speedup_large):
+        ax2.text(center, height + 1000,
                 f'{speedup:.1f}×', ha='center', va='bottom',
                 fontsize=11, fontweight='bold')
-        ax2.text(bar.get_x() + bar.get_width()/2., height/2,
-                f'{throughput_large[i]:,}\nMB/s', ha='center', va='center',
-                fontsize=9, color='white', fontweight='bold')
+    ax2.bar_label(bars2, labels=[f'{t:,}\nMB/s' for t in throughput_large], label_type='center',
+                  fontsize=9, color='white', fontweight='bold')
 
     ax2.set_ylabel('Throughput (MB/s)', fontweight='bold')
     ax2.set_title('Large Files (≥50 MB)\n5.82 MB, 485 bgzip blocks',
@@ -277,14 +308,9 @@ def plot3_io_optimization_stack(output_dir):
     ax2.grid(axis='y', alpha=0.3, linestyle=':', linewidth=0.5)
 
     # Overall title
-    fig.suptitle('I/O Optimization Stack: Layered Benefits\n(CPU parallel bgzip + smart mmap)',
-                 fontsize=16, fontweight='bold', y=1.02)
-
-    plt.tight_layout()
-    save_plot(fig, 'plot3_io_optimization_stack', output_dir)
-    plt.close()
+    overall_title(fig, 'I/O Optimization Stack: Layered Benefits\n(CPU parallel bgzip + smart mmap)')
 
-def plot4_block_size_impact(output_dir):
+def plot4_block_size_impact(fig):
     """
     Plot 4: Block Size Impact (Streaming Overhead)
 
@@ -292,28 +318,38 @@ def plot4_block_size_impact(output_dir):
     """
     print("\n=== Plot 4: Block Size Impact (Streaming Overhead) ===")
 
-    # Load streaming overhead data
-    df = pd.read_csv('results/streaming/streaming_overhead_n30.csv')
+    scale_order = ['Small', 'Medium', 'Large', 'VeryLarge']
 
-    # Filter for NEON only (shows the overhead most dramatically)
-    df_neon = df[df['config'] == 'neon']
+    csv_path = Path('results/streaming/streaming_overhead_n30.csv')
 
-    # Calculate overhead percentage
-    df_pivot = df_neon.pivot_table(
-        index=['operation', 'scale'],
-        columns='pattern',
-        values='throughput_mean'
-    ).reset_index()
+    def build():
+        # Load streaming overhead data
+        df = pd.read_csv(csv_path,
+                         usecols=['operation', 'scale', 'config', 'pattern', 'throughput_mean'],
+                         dtype={'operation': 'category', 'scale': 'category', 'config': 'category',
+                                'pattern': 'category', 'throughput_mean': 'float64'})
 
-    df_pivot['overhead_pct'] = ((df_pivot['batch'] - df_pivot['streaming']) / df_pivot['batch']) * 100
-    df_pivot['streaming_ratio'] = df_pivot['streaming'] / df_pivot['batch']
+        # Filter for NEON only (shows the overhead most dramatically)
+        df_neon = df[df['config'] == 'neon']
 
-    # Filter for interesting scales
-    scale_order = ['Small', 'Medium', 'Large', 'VeryLarge']
-    df_plot = df_pivot[df_pivot['scale'].isin(scale_order)]
+        # Calculate overhead percentage
+        df_pivot = df_neon.pivot_table(
+            index=['operation', 'scale'],
+            columns='pattern',
+            values='throughput_mean',
+            observed=True,
+        ).reset_index()
+
+        df_pivot['overhead_pct'] = ((df_pivot['batch'] - df_pivot['streaming']) / df_pivot['batch']) * 100
+        df_pivot['streaming_ratio'] = df_pivot['streaming'] / df_pivot['batch']
 
-    # Create figure
-    fig, ax = plt.subplots(figsize=(12, 6))
+        # Filter for interesting scales
+        return df_pivot[df_pivot['scale'].isin(scale_order)]
+
+    df_plot = cached_frame(csv_path, 'plot4', build, __file__)
+
+    # Create axes
+    ax = fig.subplots()
 
     # Group by operation
     operations = df_plot['operation'].unique()
@@ -346,11 +382,7 @@ def plot4_block_size_impact(output_dir):
             transform=ax.transAxes, ha='center', va='top',
             fontsize=10, bbox=dict(boxstyle='round,pad=0.5', facecolor='yellow', alpha=0.3))
 
-    plt.tight_layout()
-    save_plot(fig, 'plot4_block_size_impact', output_dir)
-    plt.close()
-
-def plot5_mmap_threshold_effect(output_dir):
+def plot5_mmap_threshold_effect(fig):
     """
     Plot 5: mmap Threshold Effect
 
@@ -366,8 +398,8 @@ def plot5_mmap_threshold_effect(output_dir):
     # Calculate speedup
     speedup = [mmap / std for mmap, std in zip(mmap_madvise, standard_io)]
 
-    # Create figure
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    # Create two subplots
+    ax1, ax2 = fig.subplots(1, 2)
 
     # --- Left subplot: Throughput comparison ---
     x = np.arange(len(file_sizes_mb))
@@ -399,8 +431,7 @@ def plot5_mmap_threshold_effect(output_dir):
                     edgecolor='black', linewidth=0.5)
 
     # Add speedup labels
-    for i, (bar, sp) in enumerate(zip(bars3, speedup)):
-        height = bar.get_height()
+    for center, height, sp in zip(*bar_tops(bars3), speedup):
         label = f'{sp:.2f}×'
         if sp < 1:
             label += '\n(slower!)'
@@ -408,7 +439,7 @@ def plot5_mmap_threshold_effect(output_dir):
         else:
             label += '\n(faster)'
             color = 'green'
-        ax2.text(bar.get_x() + bar.get_width()/2., height + 0.1,
+        ax2.text(center, height + 0.1,
                 label, ha='center', va='bottom', fontsize=10,
                 fontweight='bold', color=color)
 
@@ -432,15 +463,58 @@ def plot5_mmap_threshold_effect(output_dir):
             bbox=dict(boxstyle='round,pad=0.5', facecolor='yellow', alpha=0.3))
 
     # Overall title
-    fig.suptitle('mmap Threshold Effect: File Size Determines Benefit\n(APFS optimization with madvise hints)',
-                 fontsize=16, fontweight='bold', y=1.02)
-
-    plt.tight_layout()
-    save_plot(fig, 'plot5_mmap_threshold_effect', output_dir)
-    plt.close()
+    overall_title(fig, 'mmap Threshold Effect: File Size Determines Benefit\n(APFS optimization with madvise hints)')
+
+# Each plot draws onto a figure (or a panel of the combined figure) at this size
+PLOTS = (
+    (plot1_neon_speedup_by_operation, (10, 6)),
+    (plot2_streaming_memory_footprint, (10, 6)),
+    (plot3_io_optimization_stack, (14, 6)),
+    (plot4_block_size_impact, (12, 6)),
+    (plot5_mmap_threshold_effect, (14, 6)),
+)
+
+# Per-process figure, cleared and reused by every plot a worker renders
+_figure = None
+
+def render_plot(plot, figsize, output_dir, formats):
+    """Render one plot on this process's shared figure (pool worker entry)"""
+    global _figure
+    if _figure is None:
+        _figure = plt.figure()
+    reset_figure(_figure, figsize)
+    plot(_figure)
+    _figure.tight_layout()
+    save_plot(_figure, plot.__name__, output_dir, formats)
+
+def plot_all_combined(output_dir, formats):
+    """Render all five plots as panels of one supplementary figure (3×2 grid)"""
+    print("\n=== Combined figure: all plots ===")
+    widest = max(w for _, (w, _) in PLOTS)
+    tallest = max(h for _, (_, h) in PLOTS)
+    fig = plt.figure(figsize=(2 * widest, 3 * tallest), layout='constrained')
+    for panel, (plot, _) in zip(fig.subfigures(3, 2).flat, PLOTS):
+        plot(panel)
+    save_plot(fig, 'all_plots_combined', output_dir, formats)
+    plt.close(fig)
 
 def main():
     """Generate all publication plots"""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--combined', action='store_true',
+                        help='also render all plots as one multi-panel figure')
+    parser.add_argument('--formats', default='png',
+                        help='comma-separated output formats (default: png; '
+                             'use png,pdf for manuscript submission)')
+    args = parser.parse_args()
+    formats = tuple(fmt.strip().lower() for fmt in args.formats.split(',') if fmt.strip())
+    supported = FigureCanvasBase.get_supported_filetypes()
+    unknown = [fmt for fmt in formats if fmt not in supported]
+    if not formats or unknown:
+        parser.error(f"unsupported --formats {args.formats!r}; choose from {', '.join(sorted(supported))}")
+    extensions = formats[0] if len(formats) == 1 else '{' + ','.join(formats) + '}'
+
     print("="*60)
     print("Generating Publication-Quality Validation Plots (Artifact 3)")
     print("="*60)
@@ -449,25 +523,25 @@ def main():
     output_dir = create_output_dir()
     print(f"\nOutput directory: {output_dir}")
 
-    # Generate all plots
+    # Generate all plots; they are independent, so render them concurrently
     try:
-        plot1_neon_speedup_by_operation(output_dir)
-        plot2_streaming_memory_footprint(output_dir)
-        plot3_io_optimization_stack(output_dir)
-        plot4_block_size_impact(output_dir)
-        plot5_mmap_threshold_effect(output_dir)
+        with ProcessPoolExecutor(max_workers=min(len(PLOTS), os.cpu_count() or 1)) as pool:
+            futures = [pool.submit(render_plot, plot, figsize, output_dir, formats) for plot, figsize in PLOTS]
+            if args.combined:
+                futures.append(pool.submit(plot_all_combined, output_dir, formats))
+            for future in futures:
+                future.result()
 
         print("\n" + "="*60)
         print("✓ All 5 plots generated successfully!")
         print("="*60)
         print(f"\nOutput location: {output_dir.absolute()}")
         print("\nFiles generated:")
-        print("  1. plot1_neon_speedup_by_operation.{png,pdf}")
-        print("  2. plot2_streaming_memory_footprint.{png,pdf}")
-        print("  3. plot3_io_optimization_stack.{png,pdf}")
-        print("  4. plot4_block_size_impact.{png,pdf}")
-        print("  5. plot5_mmap_threshold_effect.{png,pdf}")
-        print("\nFormat: 300 DPI PNG + vector PDF (publication-ready)")
+        for i, (plot, _) in enumerate(PLOTS, start=1):
+            print(f"  {i}. {plot.__name__}.{extensions}")
+        if args.combined:
+            print(f"  +  all_plots_combined.{extensions}")
+        print(f"\nFormats: {', '.join(fmt.upper() for fmt in formats)} (raster output at 300 DPI)")
 
     except Exception as e:
         print(f"\n❌ Error: {e}")
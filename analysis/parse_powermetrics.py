@@ -18,78 +18,130 @@ Example:
         results/phase1_power_consumption/power_pilot_raw_20251102_143000.csv
 """
 
+import mmap
+import os
 import re
 import sys
-from datetime import datetime
+from array import array
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-import csv
+
+import numpy as np
+import pandas as pd
+
+# One pass over the log matches both line kinds:
+#   *** Sampled system activity (Sat Nov  2 14:30:05 2025 -0700) ***  -> group 1
+#   CPU Power: 12450 mW                                             -> group 2
+POWERMETRICS_RE = re.compile(rb'\*\*\* Sampled system activity \(([^)\n]+)\)|CPU Power:[ \t]+(\d+)[ \t]+mW')
+
+# Runs of whitespace, collapsed before the strptime fallback
+WHITESPACE_RE = re.compile(r'\s+')
+
+MONTHS = {name: number for number, name in enumerate(
+    ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'], start=1)}
+
+def fast_parse_pm_ts(timestamp_str):
+    """
+    Parse "Sat Nov  2 14:30:05 2025 -0700" to epoch seconds without strptime.
+
+    Raises ValueError (or KeyError/IndexError) on anything off that exact
+    layout; callers fall back to strptime.
+    """
+    _, month, day, clock, year, offset = timestamp_str.split()
+    hour, minute, second = clock.split(':')
+    if len(offset) != 5 or offset[0] not in '+-':
+        raise ValueError(f"unexpected UTC offset: {offset}")
+    offset_minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+    tz = timezone(timedelta(minutes=-offset_minutes if offset[0] == '-' else offset_minutes))
+    return datetime(int(year), MONTHS[month], int(day),
+                    int(hour), int(minute), int(second), tzinfo=tz).timestamp()
+
+@lru_cache(maxsize=None)
+def parse_sample_timestamp(timestamp_bytes):
+    """
+    Parse a powermetrics sample header timestamp (raw log bytes) to epoch seconds.
+
+    Samples arrive several times per second, so the same header string
+    repeats and is only decoded and parsed once. Returns None if it can't
+    be parsed.
+    """
+    timestamp_str = timestamp_bytes.decode('ascii', errors='replace')
+    try:
+        return fast_parse_pm_ts(timestamp_str)
+    except (ValueError, KeyError, IndexError):
+        pass
+
+    # Parse: "Sat Nov  2 14:30:05 2025 -0700"
+    # Note: Day may have single or double digit
+    try:
+        return datetime.strptime(timestamp_str.strip(), "%a %b %d %H:%M:%S %Y %z").timestamp()
+    except ValueError:
+        # Try with single-digit day
+        try:
+            # Handle extra spaces in day field
+            normalized = WHITESPACE_RE.sub(' ', timestamp_str.strip())
+            return datetime.strptime(normalized, "%a %b %d %H:%M:%S %Y %z").timestamp()
+        except ValueError as e:
+            print(f"Warning: Could not parse timestamp: {timestamp_str}: {e}", file=sys.stderr)
+            return None
 
 def parse_powermetrics_log(log_path):
     """
     Parse powermetrics log file and extract CPU power samples.
 
     Returns:
-        list of dicts: [{'timestamp': datetime, 'cpu_power_mw': float}, ...]
+        tuple of parallel arrays: (timestamps as epoch seconds, cpu_power_mw)
     """
-    samples = []
-
-    with open(log_path, 'r') as f:
-        current_timestamp = None
-
-        for line in f:
-            # Match timestamp line: *** Sampled system activity (Sat Nov  2 14:30:05 2025 -0700) ***
-            timestamp_match = re.search(r'\*\*\* Sampled system activity \(([^)]+)\)', line)
-            if timestamp_match:
-                timestamp_str = timestamp_match.group(1)
-                # Parse: "Sat Nov  2 14:30:05 2025 -0700"
-                # Note: Day may have single or double digit
-                try:
-                    current_timestamp = datetime.strptime(timestamp_str.strip(), "%a %b %d %H:%M:%S %Y %z")
-                except ValueError:
-                    # Try with single-digit day
-                    try:
-                        # Handle extra spaces in day field
-                        normalized = re.sub(r'\s+', ' ', timestamp_str.strip())
-                        current_timestamp = datetime.strptime(normalized, "%a %b %d %H:%M:%S %Y %z")
-                    except ValueError as e:
-                        print(f"Warning: Could not parse timestamp: {timestamp_str}: {e}", file=sys.stderr)
-                        continue
-
-            # Match CPU Power line: CPU Power: 12450 mW
-            power_match = re.search(r'CPU Power:\s+(\d+)\s+mW', line)
-            if power_match and current_timestamp:
-                cpu_power_mw = float(power_match.group(1))
-                samples.append({
-                    'timestamp': current_timestamp,
-                    'cpu_power_mw': cpu_power_mw
-                })
-
-    print(f"Parsed {len(samples)} power samples from powermetrics log", file=sys.stderr)
-    return samples
+    timestamps = array('d')
+    cpu_power_mw = array('d')
+
+    # Scan the log in place as bytes; only matched timestamps get decoded
+    # (an empty file can't be mapped, so it scans as empty bytes)
+    with open(log_path, 'rb') as f:
+        mapped = (mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                  if os.fstat(f.fileno()).st_size else nullcontext(b''))
+        with mapped as log_bytes:
+            current_timestamp = None
+            for match in POWERMETRICS_RE.finditer(log_bytes):
+                timestamp_bytes, power_bytes = match.groups()
+                if timestamp_bytes is not None:
+                    # An unparseable header keeps the previous sample's timestamp
+                    current_timestamp = parse_sample_timestamp(timestamp_bytes) or current_timestamp
+                elif current_timestamp:
+                    timestamps.append(current_timestamp)
+                    cpu_power_mw.append(float(power_bytes))
+
+    print(f"Parsed {len(timestamps)} power samples from powermetrics log", file=sys.stderr)
+    return timestamps, cpu_power_mw
 
 def load_pilot_csv(csv_path):
     """
     Load power pilot CSV with experiment results.
 
     Returns:
-        list of dicts: experiment data with timestamp
+        DataFrame: experiment data with parsed timestamp
     """
-    experiments = []
-
-    with open(csv_path, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Parse timestamp: "2025-11-02T14:30:00"
-            timestamp = datetime.fromisoformat(row['timestamp'])
-
-            row['timestamp'] = timestamp
-            row['loop_duration_s'] = float(row['loop_duration_s'])
-            row['num_sequences'] = int(row['num_sequences'])
-            row['iterations'] = int(row['iterations'])
-            row['sequences_processed'] = int(row['sequences_processed'])
-            row['throughput_seqs_per_sec'] = float(row['throughput_seqs_per_sec'])
-
-            experiments.append(row)
+    dtypes = {
+        'num_sequences': 'int32',
+        'iterations': 'int32',
+        'sequences_processed': 'int64',
+        'loop_duration_s': 'float64',
+        'throughput_seqs_per_sec': 'float64',
+    }
+    try:
+        # Timestamps are ISO strings: "2025-11-02T14:30:00"
+        experiments = pd.read_csv(csv_path, parse_dates=['timestamp'], dtype=dtypes)
+    except pd.errors.EmptyDataError:
+        # An aborted pilot leaves a 0-byte CSV; treat it as no experiments
+        experiments = pd.DataFrame({
+            'operation': pd.Series(dtype=object),
+            'config': pd.Series(dtype=object),
+            'scale': pd.Series(dtype=object),
+            **{col: pd.Series(dtype=dtype) for col, dtype in dtypes.items()},
+            'timestamp': pd.Series(dtype='datetime64[ns]'),
+        })
 
     print(f"Loaded {len(experiments)} experiments from pilot CSV", file=sys.stderr)
     return experiments
@@ -100,49 +152,53 @@ def correlate_power_with_experiments(power_samples, experiments):
     Calculate average power and energy consumed.
 
     Args:
-        power_samples: list of {'timestamp': datetime, 'cpu_power_mw': float}
-        experiments: list of experiment dicts with 'timestamp' and 'loop_duration_s'
+        power_samples: (timestamps, cpu_power_mw) arrays from parse_powermetrics_log
+        experiments: DataFrame with 'timestamp' and 'loop_duration_s' columns
 
     Returns:
-        list of experiments enriched with power/energy metrics
+        DataFrame of experiments enriched with power/energy metrics
     """
-    enriched = []
-
-    for exp in experiments:
-        exp_start = exp['timestamp']
-        exp_end = exp_start.timestamp() + exp['loop_duration_s']
-        exp_start_ts = exp_start.timestamp()
-
-        # Find power samples during experiment window
-        exp_power_samples = [
-            s['cpu_power_mw'] for s in power_samples
-            if exp_start_ts <= s['timestamp'].timestamp() <= exp_end
-        ]
-
-        if not exp_power_samples:
-            print(f"Warning: No power samples for experiment at {exp_start}", file=sys.stderr)
-            avg_power_mw = 0.0
-        else:
-            avg_power_mw = sum(exp_power_samples) / len(exp_power_samples)
-
-        # Calculate energy
-        avg_power_w = avg_power_mw / 1000.0
-        energy_wh = avg_power_w * (exp['loop_duration_s'] / 3600.0)
-        energy_per_seq_uwh = (energy_wh * 1e6) / exp['sequences_processed'] if exp['sequences_processed'] > 0 else 0.0
-
-        # Add metrics to experiment
-        exp_copy = exp.copy()
-        exp_copy['cpu_power_mw'] = avg_power_mw
-        exp_copy['cpu_power_w'] = avg_power_w
-        exp_copy['energy_wh'] = energy_wh
-        exp_copy['energy_per_seq_uwh'] = energy_per_seq_uwh
-        exp_copy['power_samples_count'] = len(exp_power_samples)
-
-        enriched.append(exp_copy)
-
-    return enriched
-
-def calculate_energy_efficiency(enriched_experiments):
+    # Sort samples by time once so each experiment window is a bisected slice
+    sample_timestamps = np.asarray(power_samples[0], dtype=np.float64)
+    sample_power_mw = np.asarray(power_samples[1], dtype=np.float64)
+    order = np.argsort(sample_timestamps, kind='stable')
+    sample_timestamps = sample_timestamps[order]
+    sample_power_mw = sample_power_mw[order]
+
+    # Pilot timestamps are naive local time, as datetime.timestamp() reads them
+    exp_start_ts = np.array([t.to_pydatetime().timestamp() for t in experiments['timestamp']])
+    loop_duration_s = experiments['loop_duration_s'].to_numpy()
+    exp_end = exp_start_ts + loop_duration_s
+
+    # Find power samples during each experiment window (inclusive at both ends)
+    lo = np.searchsorted(sample_timestamps, exp_start_ts, side='left')
+    hi = np.searchsorted(sample_timestamps, exp_end, side='right')
+
+    # Window sums from a running total: readings are whole mW, so the float64
+    # prefix sums (and hence the means) are exact
+    power_cumsum = np.concatenate(([0.0], np.cumsum(sample_power_mw)))
+    samples_count = hi - lo
+    avg_power_mw = np.divide(power_cumsum[hi] - power_cumsum[lo], samples_count,
+                             out=np.zeros(len(experiments)), where=samples_count > 0)
+    for exp_start in experiments['timestamp'][samples_count == 0]:
+        print(f"Warning: No power samples for experiment at {exp_start}", file=sys.stderr)
+
+    # Calculate energy
+    avg_power_w = avg_power_mw / 1000.0
+    energy_wh = avg_power_w * (loop_duration_s / 3600.0)
+    sequences_processed = experiments['sequences_processed'].to_numpy()
+    energy_per_seq_uwh = np.divide(energy_wh * 1e6, sequences_processed,
+                                   out=np.zeros(len(experiments)), where=sequences_processed > 0)
+
+    return experiments.assign(
+        cpu_power_mw=avg_power_mw,
+        cpu_power_w=avg_power_w,
+        energy_wh=energy_wh,
+        energy_per_seq_uwh=energy_per_seq_uwh,
+        power_samples_count=samples_count,
+    )
+
+def calculate_energy_efficiency(df):
     """
     Calculate energy efficiency metrics relative to naive baseline.
 
@@ -152,52 +208,49 @@ def calculate_energy_efficiency(enriched_experiments):
     Efficiency > 1.0: Better energy savings than time savings
     Efficiency < 1.0: Worse energy savings (power-hungry optimization)
     """
-    # Group by operation and scale
-    groups = {}
-    for exp in enriched_experiments:
-        key = (exp['operation'], exp['scale'])
-        if key not in groups:
-            groups[key] = []
-        groups[key].append(exp)
-
-    # For each group, calculate efficiency vs naive
-    result = []
-    for (operation, scale), exps in groups.items():
-        # Find naive baseline
-        naive = next((e for e in exps if e['config'] == 'naive'), None)
-        if not naive:
+    if df.empty:
+        return df
+    keys = ['operation', 'scale']
+
+    # Rows grouped by operation/scale, groups in order of first appearance
+    group_id = df.groupby(keys, sort=False).ngroup().to_numpy()
+    df = df.iloc[np.argsort(group_id, kind='stable')]
+
+    # Attach the (first) naive baseline of each group to every row
+    df = df.assign(time_per_iter=df['loop_duration_s'] / df['iterations'])
+    naive = (df[df['config'] == 'naive'].drop_duplicates(keys).set_index(keys)
+             [['time_per_iter', 'energy_per_seq_uwh']])
+    df = df.join(naive, on=keys, rsuffix='_naive')
+
+    exp_time = df['time_per_iter'].to_numpy()
+    exp_energy = df['energy_per_seq_uwh'].to_numpy()
+    naive_time = df['time_per_iter_naive'].to_numpy()
+    naive_energy = df['energy_per_seq_uwh_naive'].to_numpy()
+
+    time_speedup = np.divide(naive_time, exp_time, out=np.zeros(len(df)), where=exp_time > 0)
+    energy_speedup = np.divide(naive_energy, exp_energy, out=np.zeros(len(df)), where=exp_energy > 0)
+    energy_efficiency = np.divide(time_speedup, energy_speedup, out=np.zeros(len(df)), where=energy_speedup > 0)
+
+    # Naive rows are the reference point
+    is_naive = (df['config'] == 'naive').to_numpy()
+    time_speedup[is_naive] = energy_speedup[is_naive] = energy_efficiency[is_naive] = 1.0
+
+    # Groups without a naive baseline get no efficiency metrics
+    no_baseline = np.isnan(naive_time)
+    if no_baseline.any():
+        for operation, scale in df.loc[no_baseline, keys].drop_duplicates().itertuples(index=False):
             print(f"Warning: No naive baseline for {operation} {scale}", file=sys.stderr)
-            # Add experiments without efficiency metric
-            result.extend(exps)
-            continue
-
-        naive_time = naive['loop_duration_s'] / naive['iterations']  # Time per iteration
-        naive_energy = naive['energy_per_seq_uwh']
+        time_speedup[no_baseline] = energy_speedup[no_baseline] = energy_efficiency[no_baseline] = np.nan
 
-        for exp in exps:
-            exp_time = exp['loop_duration_s'] / exp['iterations']
-            exp_energy = exp['energy_per_seq_uwh']
-
-            if exp['config'] == 'naive':
-                time_speedup = 1.0
-                energy_speedup = 1.0
-                energy_efficiency = 1.0
-            else:
-                time_speedup = naive_time / exp_time if exp_time > 0 else 0.0
-                energy_speedup = naive_energy / exp_energy if exp_energy > 0 else 0.0
-                energy_efficiency = time_speedup / energy_speedup if energy_speedup > 0 else 0.0
-
-            exp['time_speedup_vs_naive'] = time_speedup
-            exp['energy_speedup_vs_naive'] = energy_speedup
-            exp['energy_efficiency'] = energy_efficiency
-
-            result.append(exp)
-
-    return result
+    return df.drop(columns=['time_per_iter', 'time_per_iter_naive', 'energy_per_seq_uwh_naive']).assign(
+        time_speedup_vs_naive=time_speedup,
+        energy_speedup_vs_naive=energy_speedup,
+        energy_efficiency=energy_efficiency,
+    )
 
 def save_enriched_csv(experiments, output_path):
-    """Save enriched experiments to CSV."""
-    if not experiments:
+    """Save enriched experiments (DataFrame) to CSV."""
+    if experiments.empty:
         print("Error: No experiments to save", file=sys.stderr)
         return
 
@@ -210,15 +263,9 @@ def save_enriched_csv(experiments, output_path):
         'power_samples_count', 'timestamp'
     ]
 
-    with open(output_path, 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for exp in experiments:
-            # Convert timestamp back to string
-            row = exp.copy()
-            row['timestamp'] = exp['timestamp'].isoformat()
-            writer.writerow(row)
+    # Timestamps go back out in the pilot's ISO format
+    experiments.assign(timestamp=experiments['timestamp'].map(datetime.isoformat)).to_csv(
+        output_path, columns=fieldnames, index=False, lineterminator='\r\n')
 
     print(f"Saved enriched CSV to: {output_path}", file=sys.stderr)
 
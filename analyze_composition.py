@@ -10,15 +10,120 @@ Usage:
 
 import pandas as pd
 import numpy as np
-from scipy import stats
+from scipy.special import stdtr
+from pathlib import Path
 import sys
 
-def load_data(csv_path):
-    """Load composition validation data"""
-    df = pd.read_csv(csv_path, comment='[')  # Skip progress lines
-    df = df[df['operation'].notna()]  # Remove any empty rows
+# The pickle cache helper lives in analysis/, which isn't on the path when
+# this script runs from the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'analysis'))
+from _cache import cached_frame
+
+# Column types of the composition CSV (labels as categoricals)
+DTYPES = {
+    'operation': 'category',
+    'complexity': 'float64',
+    'scale': 'category',
+    'num_sequences': 'Int64',
+    'backend': 'category',
+    'time_ms': 'float64',
+    'throughput_seqs_per_sec': 'float64',
+}
+
+# Rows parsed per read_csv chunk
+CHUNK_ROWS = 100_000
+
+def first_rows(df):
+    """The rows of df the analysis reads, in their original order
+
+    That is the first row of each (operation, scale) pair and of each
+    backend, plus the first measured throughput of each (operation, scale,
+    backend). Reducing a CSV chunk by chunk to these rows yields the same
+    speedups and counts as loading it whole.
+    """
+    measured = df['throughput_seqs_per_sec'].notna()
+    first_measured = ~df[measured].duplicated(['operation', 'scale', 'backend'])
+    keep = (~df.duplicated(['operation', 'scale'])
+            | ~df.duplicated('backend')
+            | first_measured.reindex(df.index, fill_value=False))
+    return df[keep]
+
+def read_reduced(csv_path):
+    """Stream the CSV in CHUNK_ROWS chunks, each reduced with first_rows()
+
+    Memory is bounded by the chunk size rather than the file size. The
+    number of experiments read is kept in df.attrs['rows_read'].
+    """
+    parts = []
+    rows_read = 0
+    with pd.read_csv(csv_path, comment='[', dtype=DTYPES,  # Skip progress lines
+                     chunksize=CHUNK_ROWS) as reader:
+        for chunk in reader:
+            chunk = chunk[chunk['operation'].notna()]  # Remove any empty rows
+            rows_read += len(chunk)
+            parts.append(first_rows(chunk))
+
+    # Chunks may infer different categories; restore one categorical per label
+    labels = {col: 'category' for col, dtype in DTYPES.items() if dtype == 'category'}
+    df = first_rows(pd.concat(parts)).astype(labels)
+    df.attrs['rows_read'] = rows_read
     return df
 
+def load_data(csv_path):
+    """Load composition validation data (reduced, memoized via cached_frame)"""
+    return cached_frame(csv_path, 'reduced', lambda: read_reduced(csv_path), __file__)
+
+# Backends every (operation, scale) pair needs for a composition ratio
+BACKENDS = ['naive', 'neon', 'neon_parallel']
+
+def expected_parallel_speedup(complexity):
+    """Expected parallel speedup with 4 threads for each complexity value
+
+    From Parallel dimension pilot observations:
+    low complexity (< 0.30) ~2×, medium (< 0.45) ~3.5×, high ~5×.
+    """
+    return np.select([complexity < 0.30, complexity < 0.45], [2.0, 3.5], default=5.0)
+
+def composition_ratios(naive_tp, neon_tp, neon_parallel_tp, complexity):
+    """Per-pair speedup and composition columns from raw throughput arrays
+
+    Takes one float64 array per backend (aligned by (operation, scale) pair)
+    plus complexity, and returns the result columns in report order.
+    """
+    # Calculate NEON speedup (vs naive)
+    speedup_neon = neon_tp / naive_tp
+
+    # Expected parallel speedup (from Parallel pilot, independent measurement)
+    expected_parallel = expected_parallel_speedup(complexity)
+
+    # Actual combined speedup
+    speedup_neon_parallel = neon_parallel_tp / naive_tp
+
+    # Observed parallel benefit (for reporting)
+    observed_parallel = neon_parallel_tp / neon_tp
+
+    # Composition ratio: actual / predicted
+    # Predicted = NEON speedup × Expected parallel benefit
+    predicted_combined = speedup_neon * expected_parallel
+    composition_ratio = np.divide(speedup_neon_parallel, predicted_combined,
+                                  out=np.zeros_like(predicted_combined),
+                                  where=predicted_combined > 0)
+
+    # |ratio - 1| as a percentage, computed in place in one buffer
+    error_pct = composition_ratio - 1.0
+    np.abs(error_pct, out=error_pct)
+    error_pct *= 100
+
+    return {
+        'speedup_neon': speedup_neon,
+        'expected_parallel': expected_parallel,
+        'observed_parallel': observed_parallel,
+        'speedup_neon_parallel': speedup_neon_parallel,
+        'predicted_combined': predicted_combined,
+        'composition_ratio': composition_ratio,
+        'error_pct': error_pct,
+    }
+
 def calculate_speedups(df):
     """Calculate speedups relative to naive baseline
 
@@ -28,67 +133,57 @@ def calculate_speedups(df):
     From Parallel pilot: 4 threads give ~3-6× speedup depending on complexity
     We'll use operation complexity to estimate expected parallel benefit.
     """
-    results = []
-
-    # Expected parallel speedup with 4 threads based on complexity
-    # From Parallel dimension pilot observations
-    def expected_parallel_speedup(complexity):
-        if complexity < 0.30:
-            return 2.0  # Low complexity: ~2× parallel benefit
-        elif complexity < 0.45:
-            return 3.5  # Medium complexity: ~3.5× parallel benefit
-        else:
-            return 5.0  # High complexity: ~5× parallel benefit
-
-    for (op, scale) in df[['operation', 'scale']].drop_duplicates().values:
-        subset = df[(df.operation == op) & (df.scale == scale)]
-
-        # Get throughputs for each backend
-        naive_throughput = subset[subset.backend == 'naive']['throughput_seqs_per_sec'].values
-        neon_throughput = subset[subset.backend == 'neon']['throughput_seqs_per_sec'].values
-        neon_parallel_throughput = subset[subset.backend == 'neon_parallel']['throughput_seqs_per_sec'].values
-
-        if len(naive_throughput) == 0 or len(neon_throughput) == 0 or len(neon_parallel_throughput) == 0:
-            continue  # Skip incomplete data
-
-        naive_tp = naive_throughput[0]
-        neon_tp = neon_throughput[0]
-        neon_parallel_tp = neon_parallel_throughput[0]
-        complexity = subset.iloc[0]['complexity']
-
-        # Calculate NEON speedup (vs naive)
-        speedup_neon = neon_tp / naive_tp
-
-        # Expected parallel speedup (from Parallel pilot, independent measurement)
-        expected_parallel = expected_parallel_speedup(complexity)
-
-        # Actual combined speedup
-        speedup_neon_parallel = neon_parallel_tp / naive_tp
-
-        # Observed parallel benefit (for reporting)
-        observed_parallel = neon_parallel_tp / neon_tp
-
-        # Composition ratio: actual / predicted
-        # Predicted = NEON speedup × Expected parallel benefit
-        predicted_combined = speedup_neon * expected_parallel
-        actual_combined = speedup_neon_parallel
-        composition_ratio = actual_combined / predicted_combined if predicted_combined > 0 else 0
-
-        results.append({
-            'operation': op,
-            'complexity': complexity,
-            'scale': scale,
-            'num_sequences': subset.iloc[0]['num_sequences'],
-            'speedup_neon': speedup_neon,
-            'expected_parallel': expected_parallel,
-            'observed_parallel': observed_parallel,
-            'speedup_neon_parallel': speedup_neon_parallel,
-            'predicted_combined': predicted_combined,
-            'composition_ratio': composition_ratio,
-            'error_pct': abs(composition_ratio - 1.0) * 100,
-        })
-
-    return pd.DataFrame(results)
+    keys = ['operation', 'scale']
+
+    # First row of each (operation, scale) pair, in order of appearance
+    pairs = df.drop_duplicates(keys).set_index(keys)[['complexity', 'num_sequences']]
+
+    # One throughput per backend (first measurement wins), one row per pair
+    throughput = (df.pivot_table(index=keys, columns='backend',
+                                 values='throughput_seqs_per_sec', aggfunc='first')
+                    .reindex(index=pairs.index, columns=BACKENDS))
+
+    complete = throughput.notna().all(axis=1).to_numpy()  # Skip incomplete data
+    pairs = pairs[complete]
+    naive_tp, neon_tp, neon_parallel_tp = throughput[complete].to_numpy(dtype='float64').T
+    complexity = pairs['complexity'].to_numpy(dtype='float64')
+
+    ratios = composition_ratios(naive_tp, neon_tp, neon_parallel_tp, complexity)
+
+    return pd.DataFrame({
+        'operation': pairs.index.get_level_values('operation'),
+        'complexity': complexity,
+        'scale': pairs.index.get_level_values('scale'),
+        'num_sequences': pairs['num_sequences'].to_numpy(),
+        **ratios,
+    })
+
+def summarize_by_operation(speedups):
+    """Per-operation averages of the per-(operation, scale) composition results
+
+    One grouped aggregation over the categorical operation column (only
+    operations present in the results), rounded and ordered by complexity.
+    """
+    return speedups.groupby('operation', observed=True).agg({
+        'complexity': 'first',
+        'speedup_neon': 'mean',
+        'expected_parallel': 'first',  # Same for all scales of an operation
+        'observed_parallel': 'mean',
+        'speedup_neon_parallel': 'mean',
+        'composition_ratio': 'mean',
+        'error_pct': 'mean',
+    }).round(2).sort_values('complexity')
+
+def one_sample_ttest(x, popmean):
+    """Two-sided one-sample t-test of mean(x) == popmean
+
+    Same statistic and p-value as scipy.stats.ttest_1samp, from the Student t
+    CDF directly (scipy.stats itself is slow to import).
+    """
+    n = len(x)
+    t_stat = (x.mean() - popmean) / (x.std(ddof=1) / np.sqrt(n))
+    p_value = 2 * stdtr(n - 1, -abs(t_stat))
+    return t_stat, p_value
 
 def main():
     if len(sys.argv) < 2:
@@ -104,7 +199,7 @@ def main():
 
     # Load data
     df = load_data(csv_path)
-    print(f"✅ Loaded {len(df)} experiments")
+    print(f"✅ Loaded {df.attrs['rows_read']} experiments")
     print(f"   - {df['operation'].nunique()} operations")
     print(f"   - {df['scale'].nunique()} scales")
     print(f"   - {df['backend'].nunique()} backends")
@@ -184,17 +279,7 @@ def main():
     print("-" * 80)
     print()
 
-    op_summary = speedups.groupby('operation').agg({
-        'complexity': 'first',
-        'speedup_neon': 'mean',
-        'expected_parallel': 'first',  # Same for all scales of an operation
-        'observed_parallel': 'mean',
-        'speedup_neon_parallel': 'mean',
-        'composition_ratio': 'mean',
-        'error_pct': 'mean',
-    }).round(2)
-
-    op_summary = op_summary.sort_values('complexity')
+    op_summary = summarize_by_operation(speedups)
     print(op_summary.to_string())
     print()
 
@@ -205,7 +290,7 @@ def main():
     print()
 
     # Test if composition ratio is significantly different from 1.0
-    t_stat, p_value = stats.ttest_1samp(speedups['composition_ratio'], 1.0)
+    t_stat, p_value = one_sample_ttest(speedups['composition_ratio'].to_numpy(), 1.0)
 
     print(f"One-sample t-test (H0: composition ratio = 1.0)")
     print(f"  t-statistic: {t_stat:.3f}")
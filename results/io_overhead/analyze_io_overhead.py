@@ -8,23 +8,64 @@ Analyzes I/O overhead impact on NEON speedup in real-world pipelines.
 Key Finding: NEON makes I/O the dominant bottleneck (78-93% overhead).
 """
 
+import argparse
+import io
+import sys
+from contextlib import redirect_stdout
+from functools import cache
+from pathlib import Path
+
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
-import seaborn as sns
 
-# Set publication-quality style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_context("paper", font_scale=1.3)
-sns.set_palette("colorblind")
+# analysis/_cache.py is two directories up from this results/ script
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'analysis'))
+from _cache import cached_frame
+
+@cache
+def figure_tools():
+    """Import Figure/FigureCanvasAgg with the plot style applied (once per process)
 
-def load_data():
-    """Load I/O overhead benchmark results"""
-    df = pd.read_csv('io_overhead_n10.csv')
-    return df
+    matplotlib and seaborn are only loaded when the plot is drawn, so
+    --no-plot runs skip their import entirely.
+    """
+    import matplotlib
+    matplotlib.use('Agg')  # headless: the figure is only ever saved, never shown
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    import seaborn as sns
+
+    # Set publication-quality style
+    matplotlib.style.use('seaborn-v0_8-darkgrid')
+    sns.set_context("paper", font_scale=1.3)
+    sns.set_palette("colorblind")
+    return Figure, FigureCanvasAgg
+
+# Low-cardinality key columns every groupby/pivot in this script uses
+CATEGORY_COLUMNS = ['operation', 'scale', 'compression', 'config']
+
+# Timing columns (seconds); only their ratios are reported, so float32 is
+# plenty. io_overhead_pct and amdahl_max_speedup stay float64 because the
+# summary tables print them at full precision.
+TIMING_COLUMNS = ['memory_median', 'memory_mean', 'file_total_median', 'file_total_mean',
+                  'file_load_median', 'file_load_mean']
+
+def load_data(csv_path=Path('io_overhead_n10.csv')):
+    """Load I/O overhead benchmark results (memoized via cached_frame)"""
+    dtypes = dict.fromkeys(CATEGORY_COLUMNS, 'category') | dict.fromkeys(TIMING_COLUMNS, 'float32')
+    return cached_frame(csv_path, 'typed', lambda: pd.read_csv(csv_path, dtype=dtypes), __file__)
+
+def config_compression_means(df):
+    """Mean I/O overhead and Amdahl speedup per (config, compression)"""
+    return df.groupby(['config', 'compression'], observed=True)[
+        ['io_overhead_pct', 'amdahl_max_speedup']].mean()
 
 def calculate_summary_stats(df):
-    """Calculate summary statistics by configuration and compression"""
+    """Calculate summary statistics by configuration and compression
+
+    Returns the mean I/O overhead and Amdahl speedup per (config,
+    compression), which plot_io_overhead reuses.
+    """
 
     print("=" * 80)
     print("I/O OVERHEAD ANALYSIS - PHASE 5")
@@ -32,13 +73,14 @@ def calculate_summary_stats(df):
     print()
 
     # Group by config and compression
-    summary = df.groupby(['config', 'compression']).agg({
+    stats = df.groupby(['config', 'compression'], observed=True).agg({
         'io_overhead_pct': ['mean', 'std', 'min', 'max'],
         'amdahl_max_speedup': ['mean', 'std', 'min', 'max']
-    }).round(2)
+    })
+    means = stats.xs('mean', axis=1, level=1)
 
     print("Summary Statistics by Configuration and Compression:")
-    print(summary)
+    print(stats.round(2))
     print()
 
     # Key insight: NEON vs Naive I/O overhead
@@ -47,12 +89,11 @@ def calculate_summary_stats(df):
     print("=" * 80)
     print()
 
+    by_compression = means.unstack('config')
     for compression in ['uncompressed', 'gzip', 'zstd']:
-        naive_io = df[(df['config'] == 'naive') & (df['compression'] == compression)]['io_overhead_pct'].mean()
-        neon_io = df[(df['config'] == 'neon') & (df['compression'] == compression)]['io_overhead_pct'].mean()
-
-        naive_amdahl = df[(df['config'] == 'naive') & (df['compression'] == compression)]['amdahl_max_speedup'].mean()
-        neon_amdahl = df[(df['config'] == 'neon') & (df['compression'] == compression)]['amdahl_max_speedup'].mean()
+        row = by_compression.loc[compression]
+        naive_io, neon_io = row['io_overhead_pct'][['naive', 'neon']]
+        naive_amdahl, neon_amdahl = row['amdahl_max_speedup'][['naive', 'neon']]
 
         print(f"{compression.upper()}:")
         print(f"  Naive:  I/O overhead = {naive_io:.1f}%  →  Max speedup = {naive_amdahl:.1f}×")
@@ -66,43 +107,46 @@ def calculate_summary_stats(df):
     print("=" * 80)
     print()
 
-    op_summary = df.groupby(['operation', 'config', 'compression']).agg({
+    op_summary = df.groupby(['operation', 'config', 'compression'], observed=True).agg({
         'io_overhead_pct': 'mean',
         'amdahl_max_speedup': 'mean'
     }).round(2)
     print(op_summary)
     print()
 
-    return summary
+    return means
 
-def plot_io_overhead(df):
+def plot_io_overhead(means):
     """
     Create publication-quality plot showing I/O overhead impact
 
     Two-panel figure:
     - Panel 1: I/O overhead percentage by compression and config
     - Panel 2: Amdahl's law maximum speedup
+
+    means is the per-(config, compression) table from calculate_summary_stats.
     """
 
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
+    Figure, FigureCanvasAgg = figure_tools()
+
+    # Standalone figure: not registered with pyplot, freed once it goes out of scope
+    fig = Figure(figsize=(14, 5))
+    FigureCanvasAgg(fig)
+    ax1, ax2 = fig.subplots(1, 2)
 
     # Panel 1: I/O Overhead Percentage
     compression_order = ['uncompressed', 'gzip', 'zstd']
     config_order = ['naive', 'neon']
 
-    # Calculate means for each compression/config combination
-    plot_data = df.groupby(['compression', 'config'])['io_overhead_pct'].mean().reset_index()
+    # Bar heights, one row per compression in plot order
+    pv = means.unstack('config').reindex(compression_order)
 
     # Create grouped bar chart
     x = np.arange(len(compression_order))
     width = 0.35
 
-    naive_values = [plot_data[(plot_data['compression'] == comp) &
-                              (plot_data['config'] == 'naive')]['io_overhead_pct'].values[0]
-                   for comp in compression_order]
-    neon_values = [plot_data[(plot_data['compression'] == comp) &
-                             (plot_data['config'] == 'neon')]['io_overhead_pct'].values[0]
-                  for comp in compression_order]
+    naive_values = pv[('io_overhead_pct', 'naive')].to_numpy()
+    neon_values = pv[('io_overhead_pct', 'neon')].to_numpy()
 
     bars1 = ax1.bar(x - width/2, naive_values, width, label='Naive (scalar)',
                     color='#5790fc', alpha=0.8)
@@ -111,11 +155,7 @@ def plot_io_overhead(df):
 
     # Add value labels on bars
     for bars in [bars1, bars2]:
-        for bar in bars:
-            height = bar.get_height()
-            ax1.text(bar.get_x() + bar.get_width()/2., height,
-                    f'{height:.0f}%',
-                    ha='center', va='bottom', fontsize=10)
+        ax1.bar_label(bars, fmt='{:.0f}%', fontsize=10)
 
     ax1.set_xlabel('Compression Format', fontweight='bold', fontsize=12)
     ax1.set_ylabel('I/O Overhead (%)', fontweight='bold', fontsize=12)
@@ -131,14 +171,8 @@ def plot_io_overhead(df):
     ax1.text(2.5, 52, '50% (I/O dominant)', fontsize=9, color='red', alpha=0.7)
 
     # Panel 2: Amdahl's Law Maximum Speedup
-    plot_data2 = df.groupby(['compression', 'config'])['amdahl_max_speedup'].mean().reset_index()
-
-    naive_amdahl = [plot_data2[(plot_data2['compression'] == comp) &
-                                (plot_data2['config'] == 'naive')]['amdahl_max_speedup'].values[0]
-                    for comp in compression_order]
-    neon_amdahl = [plot_data2[(plot_data2['compression'] == comp) &
-                               (plot_data2['config'] == 'neon')]['amdahl_max_speedup'].values[0]
-                   for comp in compression_order]
+    naive_amdahl = pv[('amdahl_max_speedup', 'naive')].to_numpy()
+    neon_amdahl = pv[('amdahl_max_speedup', 'neon')].to_numpy()
 
     bars3 = ax2.bar(x - width/2, naive_amdahl, width, label='Naive (scalar)',
                     color='#5790fc', alpha=0.8)
@@ -147,11 +181,7 @@ def plot_io_overhead(df):
 
     # Add value labels
     for bars in [bars3, bars4]:
-        for bar in bars:
-            height = bar.get_height()
-            ax2.text(bar.get_x() + bar.get_width()/2., height,
-                    f'{height:.1f}×',
-                    ha='center', va='bottom', fontsize=10)
+        ax2.bar_label(bars, fmt='{:.1f}×', fontsize=10)
 
     ax2.set_xlabel('Compression Format', fontweight='bold', fontsize=12)
     ax2.set_ylabel('Maximum Speedup (Amdahl\'s Law)', fontweight='bold', fontsize=12)
@@ -166,8 +196,8 @@ def plot_io_overhead(df):
             fontsize=10, bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5),
             ha='center')
 
-    plt.tight_layout()
-    plt.savefig('plot_io_overhead_impact.png', dpi=300, bbox_inches='tight')
+    fig.tight_layout()
+    fig.savefig('plot_io_overhead_impact.png', dpi=300, bbox_inches='tight')
     print("✅ Plot saved: plot_io_overhead_impact.png")
     print()
 
@@ -179,23 +209,24 @@ def calculate_real_world_impact(df):
     print("=" * 80)
     print()
 
-    # Compute-only speedup (from in-memory measurements)
-    compute_speedup = df.groupby(['operation', 'scale']).apply(
-        lambda x: x[x['config'] == 'naive']['memory_median'].values[0] /
-                  x[x['config'] == 'neon']['memory_median'].values[0]
-    ).mean()
+    # Compute-only speedup (from in-memory measurements), taking the first
+    # naive and NEON row of each operation/scale
+    memory = df.pivot_table(index=['operation', 'scale'], columns='config',
+                            values='memory_median', aggfunc='first', observed=True)
+    compute_speedup = np.nanmean(np.divide(memory['naive'].to_numpy(), memory['neon'].to_numpy()))
 
     print(f"Compute-only NEON speedup (in-memory): {compute_speedup:.1f}×")
     print()
 
     # End-to-end speedup (with I/O)
-    for compression in ['uncompressed', 'gzip', 'zstd']:
-        end_to_end_speedup = df[df['compression'] == compression].groupby(['operation', 'scale']).apply(
-            lambda x: x[x['config'] == 'naive']['file_total_median'].values[0] /
-                      x[x['config'] == 'neon']['file_total_median'].values[0]
-        ).mean()
+    file_total = df.pivot_table(index=['compression', 'operation', 'scale'], columns='config',
+                                values='file_total_median', aggfunc='first', observed=True)
+    end_to_end = file_total['naive'] / file_total['neon']
+    io_overheads = df.groupby('compression', observed=True, sort=False)['io_overhead_pct'].mean()
 
-        io_overhead = df[df['compression'] == compression]['io_overhead_pct'].mean()
+    for compression in ['uncompressed', 'gzip', 'zstd']:
+        end_to_end_speedup = end_to_end.loc[compression].mean()
+        io_overhead = io_overheads[compression]
 
         print(f"{compression}:")
         print(f"  End-to-end NEON speedup: {end_to_end_speedup:.2f}×")
@@ -218,25 +249,45 @@ def calculate_real_world_impact(df):
 def main():
     """Run complete I/O overhead analysis"""
 
+    parser = argparse.ArgumentParser(
+        description="Phase 5 I/O overhead analysis and plot")
+    parser.add_argument('--no-stats', action='store_true',
+                        help="skip the summary statistics report")
+    parser.add_argument('--no-realworld', action='store_true',
+                        help="skip the real-world NEON speedup report")
+    parser.add_argument('--no-plot', action='store_true',
+                        help="skip the plot (and the matplotlib import)")
+    args = parser.parse_args()
+
     # Load data
     df = load_data()
 
-    # Calculate statistics
-    summary = calculate_summary_stats(df)
+    # Assemble the text report in memory and write it in one call
+    means = None
+    with io.StringIO() as report, redirect_stdout(report):
+        # Calculate statistics
+        if not args.no_stats:
+            means = calculate_summary_stats(df)
+
+        # Real-world impact
+        if not args.no_realworld:
+            calculate_real_world_impact(df)
 
-    # Real-world impact
-    calculate_real_world_impact(df)
+        text = report.getvalue()
+    sys.stdout.write(text)
 
     # Generate plot
-    plot_io_overhead(df)
+    if not args.no_plot:
+        plot_io_overhead(config_compression_means(df) if means is None else means)
 
     print("=" * 80)
     print("ANALYSIS COMPLETE")
     print("=" * 80)
     print()
-    print("Files generated:")
-    print("  - plot_io_overhead_impact.png (300 DPI, publication-quality)")
-    print()
+    if not args.no_plot:
+        print("Files generated:")
+        print("  - plot_io_overhead_impact.png (300 DPI, publication-quality)")
+        print()
     print("Next step: Write Phase 5 findings report")
     print()
 